@@ -0,0 +1,63 @@
+"""
+Builds a zipapp (dist/CoverFetcher.pyz) for running Cover Fetcher from source without PyInstaller.
+
+Every module is byte-compiled ahead of time and stored next to its source inside the archive,
+so zipimport loads the .pyc directly instead of parsing and compiling the .py files on each launch.
+The archive is left uncompressed (ZIP_STORED), which keeps reading it a plain copy.
+assets/ and app_config.json are copied next to the .pyz, since they are loaded from disk at runtime.
+
+Usage: python build_pyz.py
+Dependencies from requirements.txt must still be installed in the interpreter that runs the .pyz.
+"""
+import pathlib
+import py_compile
+import shutil
+import sys
+import tempfile
+import zipapp
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent
+DIST_DIR = PROJECT_ROOT / "dist"
+TARGET = DIST_DIR / "CoverFetcher.pyz"
+
+SOURCE_MODULES = ["main.py", "cli.py"]
+SOURCE_PACKAGES = ["retrievers", "services", "ui", "utils"]
+DATA_FILES = ["app_config.json"]
+DATA_DIRS = ["assets"]
+
+
+def _stage_sources(staging_dir: pathlib.Path) -> None:
+    for module in SOURCE_MODULES:
+        shutil.copy2(PROJECT_ROOT / module, staging_dir / module)
+    for package in SOURCE_PACKAGES:
+        shutil.copytree(PROJECT_ROOT / package, staging_dir / package,
+                        ignore=shutil.ignore_patterns("__pycache__", "*.pyc", "*.old"))
+
+
+def _compile_sources(staging_dir: pathlib.Path) -> None:
+    # zipimport only looks for "module.pyc" beside "module.py" (not in __pycache__),
+    # so write the legacy layout. Timestamp-based pycs stay valid because copy2 keeps mtimes.
+    for source_path in staging_dir.rglob("*.py"):
+        py_compile.compile(str(source_path), cfile=str(source_path.with_suffix(".pyc")), doraise=True)
+
+
+def main() -> int:
+    DIST_DIR.mkdir(exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        staging_dir = pathlib.Path(tmp)
+        _stage_sources(staging_dir)
+        _compile_sources(staging_dir)
+        zipapp.create_archive(staging_dir, target=TARGET, interpreter="/usr/bin/env python3",
+                              main="main:main", compressed=False)
+
+    for data_file in DATA_FILES:
+        shutil.copy2(PROJECT_ROOT / data_file, DIST_DIR / data_file)
+    for data_dir in DATA_DIRS:
+        shutil.copytree(PROJECT_ROOT / data_dir, DIST_DIR / data_dir, dirs_exist_ok=True)
+
+    print(f"Built {TARGET}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,14 @@
 # cli.py
 import argparse
-import copy # For deepcopy
+import functools
 import logging
 import pathlib
+import stat
 import sys
-import traceback # For formatting exceptions, if any part of CLI needs detailed error logging
-import tempfile # For saving embedded art
+import types
 import os # For working with temporary file paths
-from typing import Optional, Tuple, Any, TYPE_CHECKING, List, Dict
+from enum import Enum
+from typing import Callable, Iterator, Optional, Tuple, Any, TYPE_CHECKING, List, Dict, Mapping, NamedTuple
 
 # Conditional import for type hinting CMD_Search, and actual import later
 if TYPE_CHECKING:
@@ -15,36 +16,155 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+class ArgDef(NamedTuple):
+    """One CLI argument definition. Still unpacks as a (flags_or_name, options) pair."""
+    flags_or_name: Tuple[str, ...]
+    options: Mapping[str, Any] # Read-only keyword arguments for add_argument()
+
+ArgDefinitions = Tuple[ArgDef, ...]
+
 # Single source of truth for CLI argument definitions
-# Each entry is a tuple: (list_of_flags_or_name, options_dictionary)
+# Each entry is an ArgDef: (tuple_of_flags_or_name, read-only options mapping)
 # 'dest' is only specified in options_dictionary if it differs from what argparse infers.
-ARG_DEFINITIONS: List[Tuple[List[str], Dict[str, Any]]] = [
-    (["-r", "--artist"],        {"type": str, "help": "Start a search with album artist"}),
-    (["-a", "--album"],         {"type": str, "help": "Start a search with album title (required if --artist is provided)"}),
-    (["query"],                 {"nargs": '?', "type": str, "help": "Album name, 'Artist - Album' string, path to a music file (acts like --from-file), or path to a directory (acts like --from-dir)."}),
-    (["--front-only"],          {"action": "store_true", "help": "Only search for front cover images"}),
-    (["--no-front-only"],       {"action": "store_true", "help": "Search for all image types (disable front-only mode)"}),
-    (["--services"],            {"type": str, "help": "Comma-separated list of services to enable (e.g. 'bandcamp,last.fm')"}),
-    (["-o", "--output-dir"],    {"type": str, "help": "Set default output directory for saving images"}),
-    (["-f", "--filename"],      {"type": str, "help": "Set default filename (without extension) for saved images"}),
-    (["-y", "--no-save-prompt"],{"action": "store_true", "help": "Save images directly to output dir without showing file dialog"}),
-    (["--exit-on-download"],    {"action": "store_true", "help": "Exit application after successfully downloading an image"}),
-    (["-i", "--from-file"],     {
-                                    "type": str,
-                                    "help": "Extracts information from a music file. "
-                                            "Artist/Album: Populated from metadata if --artist/--album are not specified. If --artist=\"\" or --album=\"\" is given, "
-                                            "those will be used (effectively disabling metadata extraction for that field). An album name is still required for a search. "
-                                            "Output Directory: Set to the file's parent if --output-dir is not specified. "
-                                            "Min Width/Height: If a local cover is found, they will be derived from the existing art's dimensions, aiming to find a strictly larger image. "
-                                            "Explicit CLI arguments (e.g., --artist \"\", --output-dir /p, --min-width 0) always take precedence."
-                                }),
-    (["--from-dir"],            {"type": str, "help": "Path to a directory. Extracts information from the first music file found and behaves like --from-file."}),
-    (["--batch-size"],          {"type": int, "help": "Number of potential images to fetch and process per service in each batch (e.g., 5)"}),
-    (["--min-width"],           {"type": int, "help": "Minimum width for downloaded images (pixels)"}),
-    (["--min-height"],          {"type": int, "help": "Minimum height for downloaded images (pixels)"}),
-    (["--existing-art-path"],   {"type": str, "help": "Path to an existing album art image to display initially."}),
-    (["--log-file"],            {"type": str, "dest": "log_file", "help": "Path to a file for logging output."}),
-]
+# Built on first use (and cached) so that importing this module doesn't allocate the table.
+def _int_at_least(minimum: int, requirement: str):
+    """Makes an argparse `type` that parses an int and rejects values below `minimum` at parse time."""
+    def _parse(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid int value: '{value}'") # Same wording as type=int
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be a {requirement} integer, got {number}")
+        return number
+    return _parse
+
+_pos_int = _int_at_least(1, "positive")
+_nonneg_int = _int_at_least(0, "non-negative")
+
+@functools.lru_cache(maxsize=1)
+def _arg_definitions() -> ArgDefinitions:
+    # Entries are immutable (tuples and read-only mappings), so they can be shared
+    # with the parser and the GUI help dialog without defensive copies.
+    _frozen = types.MappingProxyType
+    return (
+        ArgDef(("-r", "--artist"),        _frozen({"type": str, "help": "Start a search with album artist"})),
+        ArgDef(("-a", "--album"),         _frozen({"type": str, "help": "Start a search with album title (required if --artist is provided)"})),
+        ArgDef(("query",),                _frozen({"nargs": '?', "type": str, "help": "Album name, 'Artist - Album' string, path to a music file (acts like --from-file), or path to a directory (acts like --from-dir)."})),
+        ArgDef(("--front-only",),         _frozen({"action": "store_true", "help": "Only search for front cover images"})),
+        ArgDef(("--no-front-only",),      _frozen({"action": "store_true", "help": "Search for all image types (disable front-only mode)"})),
+        ArgDef(("--services",),           _frozen({"type": str, "help": "Comma-separated list of services to enable (e.g. 'bandcamp,last.fm')"})),
+        ArgDef(("-o", "--output-dir"),    _frozen({"type": str, "help": "Set default output directory for saving images"})),
+        ArgDef(("-f", "--filename"),      _frozen({"type": str, "help": "Set default filename (without extension) for saved images"})),
+        ArgDef(("-y", "--no-save-prompt"), _frozen({"action": "store_true", "help": "Save images directly to output dir without showing file dialog"})),
+        ArgDef(("--exit-on-download",),   _frozen({"action": "store_true", "help": "Exit application after successfully downloading an image"})),
+        ArgDef(("-i", "--from-file"),     _frozen({
+                                              "type": str,
+                                              "help": "Extracts information from a music file. "
+                                                      "Artist/Album: Populated from metadata if --artist/--album are not specified. If --artist=\"\" or --album=\"\" is given, "
+                                                      "those will be used (effectively disabling metadata extraction for that field). An album name is still required for a search. "
+                                                      "Output Directory: Set to the file's parent if --output-dir is not specified. "
+                                                      "Min Width/Height: If a local cover is found, they will be derived from the existing art's dimensions, aiming to find a strictly larger image. "
+                                                      "Explicit CLI arguments (e.g., --artist \"\", --output-dir /p, --min-width 0) always take precedence."
+                                          })),
+        ArgDef(("--from-dir",),           _frozen({"type": str, "help": "Path to a directory. Extracts information from the first music file found and behaves like --from-file."})),
+        ArgDef(("--batch-size",),         _frozen({"type": _pos_int, "help": "Number of potential images to fetch and process per service in each batch (e.g., 5)"})),
+        ArgDef(("--min-width",),          _frozen({"type": _nonneg_int, "help": "Minimum width for downloaded images (pixels)"})),
+        ArgDef(("--min-height",),         _frozen({"type": _nonneg_int, "help": "Minimum height for downloaded images (pixels)"})),
+        ArgDef(("--existing-art-path",),  _frozen({"type": str, "help": "Path to an existing album art image to display initially."})),
+        ArgDef(("--log-file",),           _frozen({"type": str, "dest": "log_file", "help": "Path to a file for logging output."})),
+    )
+
+@functools.lru_cache(maxsize=32)
+def _expand_path(path_str: str) -> pathlib.Path:
+    """Returns pathlib.Path(path_str).expanduser(), memoized since the same CLI paths are expanded repeatedly."""
+    return pathlib.Path(path_str).expanduser()
+
+
+# External cover art file names looked for next to a music file, in order of preference.
+_COVER_PATTERN_BASES = ("cover", "folder", "album", "front")
+_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+_IMAGE_EXTENSION_SET = frozenset(_IMAGE_EXTENSIONS)
+_COVER_TARGET_NAMES = tuple(base + ext for base in _COVER_PATTERN_BASES for ext in _IMAGE_EXTENSIONS)
+# Cover art file names looked for by the --from-dir fallback search, mapped to their preference
+# rank (lower is better). Note the different base order from _COVER_PATTERN_BASES.
+_FALLBACK_PATTERN_BASES = ("cover", "front", "folder", "album")
+_FALLBACK_TARGET_RANK: Mapping[str, int] = types.MappingProxyType({
+    name: rank for rank, name in enumerate(base + ext for base in _FALLBACK_PATTERN_BASES for ext in _IMAGE_EXTENSIONS)
+})
+# Bytes read from an image file when looking for its dimensions in the header
+_IMAGE_HEADER_READ_SIZE = 64 * 1024
+
+# Arguments whose value is copied into the config as-is when given (argparse dest -> config key).
+# "Given" means not None for valued options and True for store_true flags.
+_CLI_ARG_TO_CONFIG_KEY: Mapping[str, str] = types.MappingProxyType({
+    "no_save_prompt": "no_save_prompt",
+    "exit_on_download": "exit_on_download",
+    "batch_size": "batch_size",
+    "min_width": "min_width",
+    "min_height": "min_height",
+})
+
+_AUDIO_EXTENSIONS = frozenset({".mp3", ".flac", ".ogg", ".m4a", ".aac", ".wav", ".opus", ".aiff", ".ape", ".wv", ".dsf", ".dff"})
+
+def _iter_files_depth_first(root: str) -> Iterator[os.DirEntry]:
+    """
+    Yields the files under `root` depth-first, with each directory's entries in name order
+    (the order sorted(Path.rglob("*")) gives), so callers can stop at the first match instead
+    of listing and sorting the whole tree. Uses the file type scandir already reported, so
+    entries aren't stat'ed again. Symlinked directories aren't followed and unreadable
+    subdirectories are skipped; an unreadable `root` raises OSError.
+    """
+    with os.scandir(root) as dir_entries:
+        entries = sorted(dir_entries, key=lambda entry: os.path.normcase(entry.name))
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            try:
+                yield from _iter_files_depth_first(entry.path)
+            except OSError:
+                continue
+        elif entry.is_file():
+            yield entry
+
+def _find_first_audio_file(root: str) -> Optional[str]:
+    """Returns the path of the first music file under `root` (see _iter_files_depth_first), or None."""
+    return next((entry.path for entry in _iter_files_depth_first(root)
+                 if os.path.splitext(entry.name)[1].lower() in _AUDIO_EXTENSIONS), None)
+
+# Post-parse validation rules, checked in order: (predicate on the parsed args, error message).
+# The first rule that matches is reported through parser.error().
+_ARGUMENT_RULES: Tuple[Tuple[Callable[[argparse.Namespace], Any], str], ...] = (
+    (lambda a: a.from_dir and a.from_file, "--from-dir cannot be used with --from-file."),
+    (lambda a: a.front_only and a.no_front_only, "Cannot specify both --front-only and --no-front-only"),
+    (lambda a: a.query and (a.artist is not None or a.album is not None),
+     "Cannot use 'query' argument with --artist or --album."),
+    # Album might be "" if explicitly passed, which is different from None
+    (lambda a: a.artist and a.album is None, "--album is required when --artist is provided."),
+)
+
+# Optional dependencies of the --from-file path, imported on first use.
+# Maps module name -> module, or None if importing it already failed once.
+_optional_modules: Dict[str, Optional[types.ModuleType]] = {}
+
+def _import_optional(module_name: str) -> types.ModuleType:
+    """
+    Imports an optional dependency once and caches the outcome (including failure),
+    so repeated --from-file handling doesn't go through the import machinery again.
+    Raises ImportError if the module is unavailable.
+    """
+    try:
+        module = _optional_modules[module_name]
+    except KeyError:
+        import importlib # Only needed on the --from-file path
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            module = None
+        _optional_modules[module_name] = module
+    if module is None:
+        raise ImportError(f"No module named '{module_name}'")
+    return module
+
 
 class ArgumentParserError(Exception):
     """Custom exception for parsing errors when GUI is active."""
@@ -52,10 +172,35 @@ class ArgumentParserError(Exception):
 
 class ArgumentParserHelpRequested(Exception):
     """Custom exception for when help is requested and GUI is active."""
-    def __init__(self, arg_definitions: List[Tuple[List[str], Dict[str, Any]]]):
+    def __init__(self, arg_definitions: ArgDefinitions):
         super().__init__("Help requested")
         self.arg_definitions = arg_definitions
 
+class ParseOutcomeKind(Enum):
+    OK = "ok"
+    ERROR = "error"
+    HELP = "help"
+
+class ParseOutcome(NamedTuple):
+    """
+    Result of _parse_arguments (and _resolve_parsed_arguments): args/parser on OK, message on ERROR,
+    arg_definitions on HELP. cli_overrides is only filled in by _resolve_parsed_arguments.
+    """
+    kind: ParseOutcomeKind
+    args: Optional[argparse.Namespace] = None
+    parser: Optional[argparse.ArgumentParser] = None
+    message: Optional[str] = None
+    arg_definitions: Optional[ArgDefinitions] = None
+    cli_overrides: Optional[Dict[str, Any]] = None
+
+class CLIParseResult(NamedTuple):
+    """Return value of process_cli_arguments. Still unpacks like the plain 5-tuple it replaced."""
+    initial_ui_config: Optional[dict]
+    perform_auto_search: bool
+    initial_search_payload: Optional["CMD_Search"]
+    cli_error_message: Optional[str]
+    help_arg_definitions: Optional[ArgDefinitions]
+
 class CustomArgumentParser(argparse.ArgumentParser):
     def __init__(self, *args, is_console_mode: bool = False, **kwargs):
         self.is_console_mode = is_console_mode
@@ -101,37 +246,106 @@ class CustomArgumentParser(argparse.ArgumentParser):
             # For now, this acts as a fallback.
             # If we are here, it's an exit not due to parser.error()
             if status == 0: # Potentially help/version
-                 raise ArgumentParserHelpRequested(ARG_DEFINITIONS)
+                 raise ArgumentParserHelpRequested(_arg_definitions())
             else: # Potentially an error that bypassed .error()
                  raise ArgumentParserError(message or "Argument parsing caused an exit.")
 
 
-def _parse_arguments(is_console_mode: bool) -> Tuple[argparse.Namespace, argparse.ArgumentParser]:
+_PARSER_DESCRIPTION = "Cover Fetcher"
+
+@functools.lru_cache(maxsize=4)
+def _format_console_help(prog: str, terminal_width: int) -> str:
     """
-    Parses command-line arguments using CustomArgumentParser.
-    Raises ArgumentParserError for parsing errors in GUI mode.
-    Raises ArgumentParserHelpRequested for help requests in GUI mode.
+    Formats --help output straight from the argument definitions, laid out like argparse's
+    default help, so console help doesn't need the parser to be built.
+    The definitions are static, so the text is formatted once per (prog, width) and cached.
+    """
+    import textwrap # Only needed for help output
+    help_position = 24 # Column where descriptions start, as in argparse
+    help_width = max(terminal_width - 2 - help_position, 11)
+
+    positional_rows: List[Tuple[str, str]] = []
+    option_rows: List[Tuple[str, str]] = [("-h, --help", "show this help message and exit")]
+    for flags_or_name, options_dict in _arg_definitions():
+        help_text = options_dict.get("help", "")
+        if not flags_or_name[0].startswith("-"): # Positional
+            positional_rows.append((options_dict.get("metavar") or flags_or_name[0], help_text))
+        elif options_dict.get("action") == "store_true":
+            option_rows.append((", ".join(flags_or_name), help_text))
+        else:
+            dest = options_dict.get("dest") or flags_or_name[-1].lstrip("-").replace("-", "_")
+            metavar = options_dict.get("metavar") or dest.upper()
+            option_rows.append((", ".join(f"{flag} {metavar}" for flag in flags_or_name), help_text))
+
+    positional_usage = "".join(f" [{name}]" for name, _ in positional_rows) # All positionals are optional (nargs='?')
+    lines = [f"usage: {prog} [options]{positional_usage}", "", _PARSER_DESCRIPTION]
+    for title, rows in (("positional arguments", positional_rows), ("options", option_rows)):
+        lines += ["", f"{title}:"]
+        for invocation, help_text in rows:
+            help_lines = textwrap.wrap(help_text, help_width) or [""]
+            if len(invocation) <= help_position - 4: # Fits in front of the description column
+                lines.append(f"  {invocation:<{help_position - 2}}{help_lines.pop(0)}".rstrip())
+            else:
+                lines.append(f"  {invocation}")
+            lines += [" " * help_position + line for line in help_lines]
+    return "\n".join(lines) + "\n"
+
+
+@functools.lru_cache(maxsize=2)
+def _build_parser(is_console_mode: bool) -> CustomArgumentParser:
+    """
+    Builds the CustomArgumentParser from the argument definitions.
+    Cached per mode: parse_args() keeps no state on the parser, so re-parses can reuse it.
     """
-    # Explicitly check for help arguments before initializing the full parser
-    # This allows us to trigger our custom help dialog without argparse intervening too much.
-    if not is_console_mode and ('-h' in sys.argv or '--help' in sys.argv):
-        raise ArgumentParserHelpRequested(ARG_DEFINITIONS)
-
     parser = CustomArgumentParser(
-        description="Cover Fetcher",
+        description=_PARSER_DESCRIPTION,
         is_console_mode=is_console_mode,
         # add_help is True if console_mode, so std help prints. False if GUI, so we can show dialog.
         add_help=is_console_mode 
     )
 
-    for flags_or_name, options_dict in ARG_DEFINITIONS:
-        parser.add_argument(*flags_or_name, **options_dict)
+    for arg_def in _arg_definitions():
+        parser.add_argument(*arg_def.flags_or_name, **arg_def.options)
+    return parser
+
+
+def _parse_arguments(is_console_mode: bool) -> ParseOutcome:
+    """
+    Parses command-line arguments using CustomArgumentParser.
+    Returns a ParseOutcome instead of raising, so callers just switch on its kind.
+    In console mode, --help output and parser errors are printed here, and the process exits.
+    """
+    # Explicitly check for help arguments before initializing the full parser
+    # This allows us to trigger our custom help dialog without argparse intervening too much,
+    # and in console mode to print help without building the parser at all.
+    if not frozenset(sys.argv[1:]).isdisjoint(("-h", "--help")):
+        if not is_console_mode:
+            return ParseOutcome(ParseOutcomeKind.HELP, arg_definitions=_arg_definitions())
+        import shutil # Only needed for help output
+        sys.stdout.write(_format_console_help(os.path.basename(sys.argv[0]), shutil.get_terminal_size().columns))
+        sys.exit(0)
+
+    parser = _build_parser(is_console_mode)
 
+    # argparse expects error() never to return, so in GUI mode CustomArgumentParser still
+    # raises internally; this is the one place those exceptions are turned into outcomes.
     try:
-        args = parser.parse_args()
-    except ArgumentParserError: # Already handled by CustomArgumentParser.error
-        raise
-    except ArgumentParserHelpRequested: # Already handled by CustomArgumentParser.exit (less likely now)
+        args = _parse_and_resolve_arguments(parser, is_console_mode)
+    except ArgumentParserError as e:
+        return ParseOutcome(ParseOutcomeKind.ERROR, message=str(e))
+    except ArgumentParserHelpRequested as e: # Raised by CustomArgumentParser.exit (less likely now)
+        return ParseOutcome(ParseOutcomeKind.HELP, arg_definitions=e.arg_definitions)
+    return ParseOutcome(ParseOutcomeKind.OK, args=args, parser=parser)
+
+
+def _parse_and_resolve_arguments(parser: CustomArgumentParser, is_console_mode: bool) -> argparse.Namespace:
+    """
+    Runs parser.parse_args() and resolves the positional query, --from-dir and conflicting options.
+    Errors go through parser.error(), which raises ArgumentParserError in GUI mode.
+    """
+    try:
+        args = parser.parse_args(sys.argv[1:]) # Explicit argv; the cached parser itself holds no per-call state
+    except (ArgumentParserError, ArgumentParserHelpRequested): # Already handled by CustomArgumentParser
         raise
     except Exception as e: # Catch other potential argparse issues
         if not is_console_mode:
@@ -150,161 +364,154 @@ def _parse_arguments(is_console_mode: bool) -> Tuple[argparse.Namespace, argpars
     # Add internal attribute to store original --from-dir path if used.
     # This attribute is not meant to be set directly by users via CLI.
     args._internal_original_from_dir_path = None
+    # Record whether --existing-art-path came from the command line itself, before
+    # --from-file/--from-dir handling can fill it in, so later validation needn't rescan sys.argv.
+    args._internal_existing_art_path_explicit = args.existing_art_path is not None
 
     # First, handle the positional query argument, as it might define --from-file or --from-dir behavior.
     # This runs before explicit --from-dir processing so that if query sets args.from_dir,
     # the subsequent block can process it.
     if args.query:
         try:
-            potential_path = pathlib.Path(args.query).expanduser()
+            potential_path = _expand_path(args.query)
+            # One stat answers both "is it a directory?" and "is it a file?"
+            try:
+                query_mode = os.stat(potential_path).st_mode
+            except (FileNotFoundError, NotADirectoryError, ValueError): # Not an existing path (the usual case)
+                query_mode = 0
 
-            if potential_path.is_dir():
+            if stat.S_ISDIR(query_mode):
                 # Positional query is a directory.
                 # Check for conflict with *explicitly* provided --from-dir or --from-file flags.
                 # (args.from_dir and args.from_file would be non-None here only if set by explicit flags)
-                if args.from_dir is not None: 
-                    parser.error("Cannot use a directory path as a positional query when --from-dir is also specified.")
-                if args.from_file is not None: 
-                    parser.error("Cannot use a directory path as a positional query when --from-file is also specified.")
+                _reject_query_path_conflicts(args, parser, "directory", ("from_dir", "from_file"))
                 
                 # No conflicts, so set args.from_dir from the query.
                 # This will be processed by the subsequent "if args.from_dir:" block.
-                logger.info(f"Positional query argument '{args.query}' is an existing directory. Will be processed as --from-dir.")
+                logger.info("Positional query argument '%s' is an existing directory. Will be processed as --from-dir.", args.query)
                 args.from_dir = str(potential_path.resolve())
                 args.query = None  # Clear query to prevent it from being parsed as "Artist - Album".
 
-            elif potential_path.is_file():
+            elif stat.S_ISREG(query_mode):
                 # Positional query is a file.
                 # Check for conflict with *explicitly* provided --from-file or --from-dir flags.
-                if args.from_file is not None: 
-                     parser.error("Cannot use a file path as a positional query when --from-file is also specified.")
-                if args.from_dir is not None: 
-                     parser.error("Cannot use a file path as a positional query when --from-dir is also specified.")
+                _reject_query_path_conflicts(args, parser, "file", ("from_file", "from_dir"))
 
                 # No conflicts, so set args.from_file from the query.
                 # This will be used by _handle_from_file_logic later.
-                logger.info(f"Positional query argument '{args.query}' is an existing file. Processing as --from-file.")
+                logger.info("Positional query argument '%s' is an existing file. Processing as --from-file.", args.query)
                 args.from_file = str(potential_path.resolve())
                 args.query = None  # Clear query.
+        except ArgumentParserError: # A conflict reported above, not a problem with the path itself
+            raise
         except OSError as e:
             # This might happen for exceptionally long or malformed path strings.
-            logger.debug(f"Could not evaluate positional query '{args.query}' as a potential path due to OSError: {e}. Will proceed to treat as string query.")
+            logger.debug("Could not evaluate positional query '%s' as a potential path due to OSError: %s. Will proceed to treat as string query.", args.query, e)
         except Exception as e: # Catch any other unexpected error during path processing
-            logger.warning(f"Unexpected error while checking if query '{args.query}' is a path: {e}. Will proceed to treat as string query.")
+            logger.warning("Unexpected error while checking if query '%s' is a path: %s. Will proceed to treat as string query.", args.query, e)
+
+    # Option conflicts and requirements. Checked once the query has been resolved, so a query that
+    # became --from-dir still conflicts with an explicit --from-file.
+    for violates, message in _ARGUMENT_RULES:
+        if violates(args):
+            parser.error(message)
 
     # Next, process --from-dir (if set, either by explicit flag or by the query argument).
     # This block finds a music file within the directory and sets args.from_file accordingly.
     if args.from_dir:
-        # At this point, args.from_dir is set.
-        # args.from_file might be None (if --from-dir came from query or explicit --from-dir without explicit --from-file)
-        # or args.from_file might be set if an explicit --from-file flag was used.
-        # The latter case is a conflict if args.from_dir is also active.
-        if args.from_file: 
-            # This implies explicit --from-file was used alongside 
-            # (explicit --from-dir OR query-as-directory which set args.from_dir).
-            parser.error("--from-dir cannot be used with --from-file.")
-        
-        from_dir_path = pathlib.Path(args.from_dir).expanduser()
+        from_dir_path = _expand_path(args.from_dir)
         if not from_dir_path.is_dir():
             # This check is important if --from-dir was explicit and invalid.
             # If set by query, is_dir() was already checked.
             parser.error(f"--from-dir path '{args.from_dir}' is not a valid directory or does not exist.")
 
         # Find the first music file recursively
-        AUDIO_EXTENSIONS = {".mp3", ".flac", ".ogg", ".m4a", ".aac", ".wav", ".opus", ".aiff", ".ape", ".wv", ".dsf", ".dff"}
-        found_music_file = None
-        
         try:
-            paths_to_check = sorted(list(from_dir_path.rglob("*")))
-        except Exception as e:
+            found_music_file = _find_first_audio_file(str(from_dir_path))
+        except OSError as e:
             parser.error(f"Error reading directory specified by --from-dir '{args.from_dir}': {e}")
-
-        for item_path in paths_to_check:
-            if item_path.is_file() and item_path.suffix.lower() in AUDIO_EXTENSIONS:
-                found_music_file = item_path
-                break
         
         if not found_music_file:
             parser.error(f"No music files found in directory '{args.from_dir}' (and its subdirectories).")
         
-        logger.info(f"--from-dir '{args.from_dir}': Using music file '{found_music_file}' for metadata.")
+        logger.info("--from-dir '%s': Using music file '%s' for metadata.", args.from_dir, found_music_file)
         # Set args.from_file based on the music file found in the directory.
         # This allows _handle_from_file_logic to proceed as if --from-file was given with this path.
-        args.from_file = str(found_music_file.resolve()) 
+        args.from_file = str(pathlib.Path(found_music_file).resolve()) 
         args._internal_original_from_dir_path = str(from_dir_path.resolve()) # Store original --from-dir path
         # We don't clear args.from_dir here; its presence is a flag that --from-file was derived
         # from a directory operation, which is useful for _handle_from_dir_art_search_fallback.
 
-    # These parser.error() calls will now go through CustomArgumentParser.error()
     # This 'if args.query:' will now only be true if:
     # 1. The query was not a file.
     # 2. The query was a file, but --from-file was also specified (which would have errored above).
     # 3. An unexpected error occurred while checking if the query was a file.
-    if args.query:
-        if args.artist is not None or args.album is not None:
-            parser.error("Cannot use 'query' argument with --artist or --album.")
-        if " - " in args.query:
-            artist, album = args.query.split(" - ", 1)
+    if args.query: # --artist/--album alongside a query was rejected by _ARGUMENT_RULES
+        artist, separator, album = args.query.partition(" - ")
+        if separator:
             args.artist = artist.strip()
             args.album = album.strip()
         else:
             args.album = args.query.strip()
 
-    if args.artist and not args.album: # Album might be "" if explicitly passed, which is different from None
-        if args.album is None: # If --artist is given, --album must also be given (even if empty)
-            parser.error("--album is required when --artist is provided.")
+    return args
 
-    if args.front_only and args.no_front_only:
-        parser.error("Cannot specify both --front-only and --no-front-only")
-    
-    return args, parser # Parser instance might still be useful for _apply_general_cli_overrides error reporting
+
+def _reject_query_path_conflicts(
+    args: argparse.Namespace, 
+    parser: argparse.ArgumentParser, 
+    path_kind: str, 
+    explicit_dests: Tuple[str, ...]
+) -> None:
+    """Errors if a positional query that is a `path_kind` path is combined with any of the given explicit options."""
+    for dest in explicit_dests:
+        if getattr(args, dest) is not None:
+            parser.error(f"Cannot use a {path_kind} path as a positional query when --{dest.replace('_', '-')} is also specified.")
 
 
-def _apply_general_cli_overrides(
+def _collect_general_cli_overrides(
     args: argparse.Namespace, 
-    initial_ui_config: dict, 
+    base_config: dict, 
     default_config_base: dict, 
     parser: argparse.ArgumentParser
-) -> None:
-    """Applies general CLI arguments (not --from-file specific setup) to initial_ui_config."""
+) -> Dict[str, Any]:
+    """
+    Collects the config overrides from general CLI arguments (not --from-file specific setup).
+    base_config is only read. Returns the top-level keys to replace, empty if nothing is overridden.
+    """
+    updates: Dict[str, Any] = {}
 
     if args.existing_art_path: # This path might come from --from-file or direct --existing-art-path
-        art_path = pathlib.Path(args.existing_art_path).expanduser()
+        art_path = _expand_path(args.existing_art_path)
         if art_path.is_file():
-            initial_ui_config["current_album_art_path"] = str(art_path.resolve())
+            updates["current_album_art_path"] = str(art_path.resolve())
         else:
-            logger.warning(f"Specified existing art path is not a file or does not exist: {art_path}")
+            logger.warning("Specified existing art path is not a file or does not exist: %s", art_path)
             # Only error out if --existing-art-path was EXPLICITLY provided and is invalid.
-            if any(arg_part.startswith('--existing-art-path') for arg_part in sys.argv):
+            if args._internal_existing_art_path_explicit:
                  parser.error(f"Explicitly provided --existing-art-path '{art_path}' is not a valid file.")
 
     if args.front_only: # args.no_front_only already handled by parser mutual exclusivity in _parse_arguments
-        initial_ui_config["front_only"] = True
+        updates["front_only"] = True
     elif args.no_front_only:
-        initial_ui_config["front_only"] = False
+        updates["front_only"] = False
 
     if args.output_dir: # This dir might come from --from-file or direct --output-dir
-        output_dir_path = pathlib.Path(args.output_dir).expanduser()
+        output_dir_path = _expand_path(args.output_dir)
         # Allow if it's a dir OR if it doesn't exist yet (will be created on save)
         if output_dir_path.is_dir() or not output_dir_path.exists():
-            initial_ui_config["default_output_dir"] = str(output_dir_path)
+            updates["default_output_dir"] = str(output_dir_path)
         else: # Exists but is not a directory (e.g., it's a file)
-            logger.error(f"Invalid output directory specified (exists but is not a directory): {output_dir_path}")
+            logger.error("Invalid output directory specified (exists but is not a directory): %s", output_dir_path)
             parser.error(f"Output directory '{output_dir_path}' exists and is not a directory.")
 
     if args.filename:
         clean_filename = args.filename.strip()
         if clean_filename:
-            initial_ui_config["default_filename"] = clean_filename
+            updates["default_filename"] = clean_filename
         else:
             parser.error("Empty filename specified via --filename.")
 
-    if args.no_save_prompt:
-        initial_ui_config["no_save_prompt"] = True
-
-    if args.exit_on_download:
-        initial_ui_config["exit_on_download"] = True
-
     if args.services:
         cli_service_names_input_lower_set = {name.strip().lower() for name in args.services.split(',') if name.strip()}
         
@@ -317,12 +524,12 @@ def _apply_general_cli_overrides(
                         isinstance(s_entry[0], str) and isinstance(s_entry[1], bool)):
                     valid_config.append((s_entry[0], s_entry[1])) # (CanonicalName, OriginalEnabledState)
                 else:
-                    logger.warning(f"Malformed service entry in base config: {s_entry}. Skipping.")
+                    logger.warning("Malformed service entry in base config: %s. Skipping.", s_entry)
             return valid_config
 
         # Determine the base service configuration and order.
-        # Priority: initial_ui_config (user's saved order) -> default_config_base.
-        base_service_config = _get_valid_base_service_config(initial_ui_config.get("services"))
+        # Priority: base_config (user's saved order) -> default_config_base.
+        base_service_config = _get_valid_base_service_config(base_config.get("services"))
         if not base_service_config:
             logger.warning("User 'services' config malformed/missing. Falling back to default for CLI --services processing.")
             base_service_config = _get_valid_base_service_config(default_config_base.get("services", []))
@@ -330,135 +537,158 @@ def _apply_general_cli_overrides(
                 logger.error("Default 'services' config also malformed or empty. Cannot process --services.")
                 # base_service_config remains empty, loop below will produce empty list.
 
-        # Validate that all CLI-provided service names are known (exist in base_service_config)
-        known_canonical_names_lower_set = {canonical_name.lower() for canonical_name, _ in base_service_config}
-        for cli_name_lower in cli_service_names_input_lower_set:
-            if cli_name_lower not in known_canonical_names_lower_set:
-                available_names_str = ', '.join(sorted([name for name, _ in base_service_config]))
-                parser.error(f"Service '{cli_name_lower}' is not a recognized service. Choose from: {available_names_str or 'None available'}")
-        
-        # Build the new services list, preserving order from base_service_config
-        # Services mentioned in CLI are enabled, others are disabled.
+        # Build the new services list in one pass, preserving order from base_service_config.
+        # Services mentioned in CLI are enabled, others are disabled; whatever CLI names are
+        # left unmatched afterwards are unknown.
         final_services_list_of_lists = []
+        unknown_names_lower = set(cli_service_names_input_lower_set)
         for canonical_name, _original_enabled_state in base_service_config:
-            is_enabled_by_cli = canonical_name.lower() in cli_service_names_input_lower_set
-            final_services_list_of_lists.append([canonical_name, is_enabled_by_cli])
+            canonical_name_lower = canonical_name.lower()
+            final_services_list_of_lists.append([canonical_name, canonical_name_lower in cli_service_names_input_lower_set])
+            unknown_names_lower.discard(canonical_name_lower)
+
+        if unknown_names_lower:
+            unknown_names_str = ', '.join(f"'{name}'" for name in sorted(unknown_names_lower))
+            available_names_str = ', '.join(sorted(name for name, _ in final_services_list_of_lists))
+            parser.error(f"Service(s) {unknown_names_str} not recognized. Choose from: {available_names_str or 'None available'}")
         
-        initial_ui_config["services"] = final_services_list_of_lists
+        updates["services"] = final_services_list_of_lists
 
-    if args.batch_size is not None:
-        if args.batch_size < 1: parser.error("--batch-size must be a positive integer.")
-        initial_ui_config["batch_size"] = args.batch_size
+    # Ranges of --batch-size/--min-width/--min-height are validated by their argparse types at parse time.
+    # min_width/min_height might also have been derived by --from-file from existing art (always positive).
 
-    # min_width/min_height might be set by --from-file or directly by CLI.
-    # _handle_from_file_logic already modified args.min_width/args.min_height if needed.
-    if args.min_width is not None:
-        if args.min_width < 0: parser.error("--min-width must be a non-negative integer.")
-        initial_ui_config["min_width"] = args.min_width
+    # Plain pass-through arguments: one lookup each, no per-option branches
+    for arg_dest, config_key in _CLI_ARG_TO_CONFIG_KEY.items():
+        value = getattr(args, arg_dest)
+        if value is not None and value is not False:
+            updates[config_key] = value
 
-    if args.min_height is not None:
-        if args.min_height < 0: parser.error("--min-height must be a non-negative integer.")
-        initial_ui_config["min_height"] = args.min_height
+    return updates
 
 
-def _handle_from_file_logic(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+def _find_external_cover_art(directory: pathlib.Path) -> Optional[str]:
+    """
+    Looks for a cover image file in `directory`: first by well-known names (cover.jpg, folder.png, ...),
+    then falls back to the first image file. Returns its path, or None if there is none.
+    """
+    found_art_path_str = None
+    try:
+        # Index the directory once (lowercased name -> path). DirEntry.is_file() can usually
+        # answer from the directory listing itself, without a separate stat per entry.
+        files_by_lower_name: Dict[str, str] = {}
+        with os.scandir(directory) as dir_entries:
+            for entry in dir_entries:
+                if entry.is_file():
+                    files_by_lower_name.setdefault(entry.name.lower(), entry.path)
+
+        for target_filename_lower in _COVER_TARGET_NAMES:
+            found_art_path_str = files_by_lower_name.get(target_filename_lower)
+            if found_art_path_str:
+                logger.info("Found existing art (pattern match): %s", found_art_path_str)
+                break
+
+        if not found_art_path_str: # Fallback: first image file
+            for name_lower, path_str in files_by_lower_name.items():
+                if os.path.splitext(name_lower)[1] in _IMAGE_EXTENSION_SET:
+                    found_art_path_str = path_str
+                    logger.info("Found first available image file as existing art: %s", found_art_path_str)
+                    break
+    except OSError as e:
+        logger.warning("Could not list directory %s to find external art: %s", directory, e)
+    return found_art_path_str
+
+
+def _handle_from_file_logic(
+    args: argparse.Namespace, 
+    parser: argparse.ArgumentParser, 
+    extract_embedded_art: bool = True
+) -> None:
     """
     Handles all logic related to the --from-file argument.
     Modifies `args` in-place with extracted metadata, output dir, and existing art info.
+    If extract_embedded_art is False, art embedded in the music file is not looked at (and mutagen not imported).
     """
     if not args.from_file:
         return
 
-    file_path_obj = pathlib.Path(args.from_file).expanduser()
+    file_path_obj = _expand_path(args.from_file)
     if not file_path_obj.exists():
         parser.error(f"File not found: {file_path_obj}")
 
+    # Decide up front which passes are needed at all
+    need_metadata = args.artist is None or args.album is None or args.output_dir is None
+    need_art = args.existing_art_path is None # Only look for art if --existing-art-path wasn't explicitly given
+
     # --- Metadata Extraction (taglib) ---
-    try:
-        import taglib # Import only when needed
-        with taglib.File(str(file_path_obj)) as audio_file:
-            artist_tags = audio_file.tags.get("ALBUMARTIST", audio_file.tags.get("ARTIST", [""]))
-            album_tags = audio_file.tags.get("ALBUM", [""])
+    # Skipped entirely (no taglib import or file read) when the CLI already provides everything it would fill in.
+    if need_metadata:
+        try:
+            taglib = _import_optional("taglib")
+            with taglib.File(str(file_path_obj)) as audio_file:
+                tags = audio_file.tags
+                artist_tags = tags.get("ALBUMARTIST") or tags.get("ARTIST") or ()
+                album_tags = tags.get("ALBUM") or ()
             
-            artist_from_file = artist_tags[0] if artist_tags else ""
-            album_from_file = album_tags[0] if album_tags else ""
+                artist_from_file = artist_tags[0] if artist_tags else ""
+                album_from_file = album_tags[0] if album_tags else ""
 
-            if args.artist is None: # Only set from file if not provided via CLI
-                args.artist = artist_from_file
-            if args.album is None: # Only set from file if not provided via CLI
-                args.album = album_from_file
+                if args.artist is None: # Only set from file if not provided via CLI
+                    args.artist = artist_from_file
+                if args.album is None: # Only set from file if not provided via CLI
+                    args.album = album_from_file
             
-            logger.info(f"After taglib processing for {file_path_obj}: Artist='{args.artist}', Album='{args.album}'")
+                logger.info("After taglib processing for %s: Artist='%s', Album='%s'", file_path_obj, args.artist, args.album)
             
-            if args.output_dir is None: # Only set from file if not provided via CLI
-                args.output_dir = str(file_path_obj.parent)
-                logger.info(f"Set output directory from file to: {args.output_dir}")
-
-    except ImportError:
-        logger.warning("python-taglib library not found. Cannot extract metadata from music file. To enable this, 'pip install python-taglib'.")
-    except taglib.TaglibError as e:
-        logger.error(f"Error reading metadata from {file_path_obj} (taglib): {e}")
-        parser.error(f"Could not read metadata from file {file_path_obj} (taglib error).")
-    except Exception as e: # Catch other potential errors during file processing
-        logger.error(f"Error processing file metadata for {file_path_obj}: {e}\n{traceback.format_exc()}")
-        parser.error(f"Failed to process file metadata for {file_path_obj}.")
+                if args.output_dir is None: # Only set from file if not provided via CLI
+                    args.output_dir = str(file_path_obj.parent)
+                    logger.info("Set output directory from file to: %s", args.output_dir)
+
+        except ImportError:
+            logger.warning("python-taglib library not found. Cannot extract metadata from music file. To enable this, 'pip install python-taglib'.")
+        except taglib.TaglibError as e:
+            logger.error("Error reading metadata from %s (taglib): %s", file_path_obj, e)
+            parser.error(f"Could not read metadata from file {file_path_obj} (taglib error).")
+        except Exception as e: # Catch other potential errors during file processing
+            logger.exception("Error processing file metadata for %s: %s", file_path_obj, e)
+            parser.error(f"Failed to process file metadata for {file_path_obj}.")
 
     # After potential metadata extraction (even if it failed but didn't exit),
     # ensure album (which is mandatory for search) is present if artist is.
     # If --from-file was used, and album is still None or empty, it's an issue.
     if args.album == "" or args.album is None: # Checking explicitly for empty string too
-        logger.error(f"Album is mandatory for a search. It was not found in metadata of '{file_path_obj}' or not acceptably provided via --album argument in conjunction with --from-file.")
+        logger.error("Album is mandatory for a search. It was not found in metadata of '%s' or not acceptably provided via --album argument in conjunction with --from-file.", file_path_obj)
         parser.error(f"Album is mandatory. No valid album name derived from file '{file_path_obj}' or --album argument.")
 
 
     # --- Attempt to find existing cover art (external or embedded) for --from-file ---
-    if args.existing_art_path is None: # Only try if --existing-art-path wasn't explicitly given
+    if need_art:
         music_file_parent_dir = file_path_obj.parent
-        found_art_path_str = None
+        found_art_data = None # Bytes of the art if it was extracted from the music file
         
         # 1. Search for common external art files
-        pattern_bases = ["cover", "folder", "album", "front"]
-        image_extensions = [".jpg", ".jpeg", ".png"]
-        try:
-            items_in_dir = list(music_file_parent_dir.iterdir())
-            for base_name in pattern_bases:
-                if found_art_path_str: break
-                for ext in image_extensions:
-                    target_filename_lower = (base_name + ext).lower()
-                    for item in items_in_dir:
-                        if item.is_file() and item.name.lower() == target_filename_lower:
-                            found_art_path_str = str(item)
-                            logger.info(f"Found existing art (pattern match): {found_art_path_str}")
-                            break 
-                    if found_art_path_str: break
-            
-            if not found_art_path_str: # Fallback: first image file
-                for item in items_in_dir:
-                    if item.is_file() and item.suffix.lower() in image_extensions:
-                        found_art_path_str = str(item)
-                        logger.info(f"Found first available image file as existing art: {found_art_path_str}")
-                        break
-        except OSError as e:
-            logger.warning(f"Could not list directory {music_file_parent_dir} to find external art: {e}")
-
+        found_art_path_str = _find_external_cover_art(music_file_parent_dir)
 
         # 2. If no external art found, try to extract embedded art
-        if not found_art_path_str:
-            logger.info(f"No external art file found in {music_file_parent_dir}. Attempting to extract embedded art from {file_path_obj}.")
+        if not found_art_path_str and extract_embedded_art:
+            logger.info("No external art file found in %s. Attempting to extract embedded art from %s.", music_file_parent_dir, file_path_obj)
             best_picture_data = None
             best_picture_ext = ".jpg"
             try:
-                import mutagen
+                mutagen = _import_optional("mutagen")
                 m_file = mutagen.File(str(file_path_obj))
                 if m_file:
-                    pictures_to_check = []
-                    if m_file.pictures: pictures_to_check.extend(m_file.pictures) # FLAC, Ogg
-                    if hasattr(m_file, 'tags'): # ID3, MP4
-                        if isinstance(m_file.tags, mutagen.id3.ID3): pictures_to_check.extend(m_file.tags.getall('APIC'))
-                        elif isinstance(m_file.tags, mutagen.mp4.MP4Tags):
-                            covr_tags = m_file.tags.get('covr'); 
-                            if covr_tags: pictures_to_check.extend(covr_tags)
-                    
+                    # Chained lazily so the loop below can stop at the first front cover
+                    # without gathering every embedded picture first.
+                    import itertools # Only needed when looking for embedded art
+                    # Tag containers are told apart by shape/type name rather than isinstance, which would
+                    # reach into mutagen.id3 / mutagen.mp4 for files that use neither.
+                    m_tags = getattr(m_file, 'tags', None)
+                    pictures_to_check = itertools.chain(
+                        getattr(m_file, 'pictures', None) or (), # FLAC, Ogg
+                        m_tags.getall('APIC') if hasattr(m_tags, 'getall') else (), # ID3 (also its AIFF/WAVE subclasses)
+                        (m_tags.get('covr') or ()) if type(m_tags).__name__ == "MP4Tags" else (), # MP4
+                    )
+
                     front_cover_data, front_cover_ext, any_cover_data, any_cover_ext = None, None, None, None
                     for pic in pictures_to_check:
                         pic_data, pic_ext_current, pic_type = None, None, getattr(pic, 'type', 0) # type 3 is front cover
@@ -468,10 +698,10 @@ def _handle_from_file_logic(args: argparse.Namespace, parser: argparse.ArgumentP
                             mime_type = getattr(pic, 'mime', '').lower()
                             if 'jpeg' in mime_type or 'jpg' in mime_type: pic_ext_current = ".jpg"
                             elif 'png' in mime_type: pic_ext_current = ".png"
-                        elif isinstance(pic, mutagen.mp4.MP4Cover): # mutagen.mp4.MP4Cover
+                        elif type(pic).__name__ == "MP4Cover": # mutagen.mp4.MP4Cover
                             pic_data = bytes(pic) # Data is the object itself
-                            if pic.imageformat == mutagen.mp4.MP4Cover.FORMAT_JPEG: pic_ext_current = ".jpg"
-                            elif pic.imageformat == mutagen.mp4.MP4Cover.FORMAT_PNG: pic_ext_current = ".png"
+                            if pic.imageformat == pic.FORMAT_JPEG: pic_ext_current = ".jpg"
+                            elif pic.imageformat == pic.FORMAT_PNG: pic_ext_current = ".png"
                         
                         if not pic_data or not pic_ext_current: continue
 
@@ -482,16 +712,25 @@ def _handle_from_file_logic(args: argparse.Namespace, parser: argparse.ArgumentP
                     elif any_cover_data: best_picture_data, best_picture_ext = any_cover_data, any_cover_ext
 
             except ImportError: logger.warning("Mutagen library not found. Cannot extract embedded album art. To enable this, 'pip install mutagen'.")
-            except Exception as e: logger.error(f"Error extracting embedded art using Mutagen from {file_path_obj}: {e}\n{traceback.format_exc()}")
+            except Exception as e:
+                logger.exception("Error extracting embedded art using Mutagen from %s: %s", file_path_obj, e)
 
             if best_picture_data:
+                import tempfile # Only needed when embedded art is actually extracted
                 try:
                     fd, temp_image_path = tempfile.mkstemp(suffix=best_picture_ext, prefix="aad_embedded_")
-                    with os.fdopen(fd, 'wb') as tmp_file: tmp_file.write(best_picture_data)
+                    try:
+                        # Write straight to the descriptor; os.write may write partially, so loop.
+                        remaining = memoryview(best_picture_data)
+                        while remaining:
+                            remaining = remaining[os.write(fd, remaining):]
+                    finally:
+                        os.close(fd)
                     found_art_path_str = temp_image_path
-                    logger.info(f"Successfully extracted embedded art to temporary file: {found_art_path_str}")
+                    found_art_data = best_picture_data
+                    logger.info("Successfully extracted embedded art to temporary file: %s", found_art_path_str)
                 except Exception as e:
-                    logger.error(f"Failed to save extracted embedded art to temporary file: {e}\n{traceback.format_exc()}")
+                    logger.exception("Failed to save extracted embedded art to temporary file: %s", e)
                     if 'temp_image_path' in locals() and os.path.exists(temp_image_path):
                         try: os.remove(temp_image_path)
                         except OSError: pass
@@ -499,70 +738,85 @@ def _handle_from_file_logic(args: argparse.Namespace, parser: argparse.ArgumentP
         
         # 3. If art was found (external or embedded), set args.existing_art_path and try to get dimensions
         if found_art_path_str:
-            _set_existing_art_and_derive_dimensions(args, found_art_path_str, f"--from-file ('{file_path_obj.name}') source")
+            _set_existing_art_and_derive_dimensions(args, found_art_path_str, f"--from-file ('{file_path_obj.name}') source",
+                                                    image_data=found_art_data)
 
 
 def _set_existing_art_and_derive_dimensions(
     args: argparse.Namespace, 
     found_art_path_str: str, 
-    source_description_for_log: str
+    source_description_for_log: str,
+    image_data: Optional[bytes] = None
 ) -> None:
     """
     Sets args.existing_art_path and, if min_width/min_height are not CLI-set,
     derives them from the found art, aiming for a strictly larger image.
+    PNG/JPEG dimensions are read from the image header (image_data if the art's bytes
+    are already in memory, else the start of the file) without loading Pillow.
     """
     args.existing_art_path = found_art_path_str
-    logger.info(f"Using existing art from {source_description_for_log}: {found_art_path_str}")
+    logger.info("Using existing art from %s: %s", source_description_for_log, found_art_path_str)
 
     # Only derive dimensions if min_width or min_height were not explicitly set by CLI
     if args.min_width is None or args.min_height is None:
         try:
-            from PIL import Image # Import only when needed
-            with Image.open(found_art_path_str) as img:
-                img_width, img_height = img.size
-                
-                cli_set_min_width = args.min_width is not None
-                cli_set_min_height = args.min_height is not None
-                
-                derived_w, derived_h = None, None
-
-                if not cli_set_min_width:
-                    derived_w = img_width
-                    args.min_width = img_width # Temporarily assign for logic below
-                if not cli_set_min_height:
-                    derived_h = img_height
-                    args.min_height = img_height # Temporarily assign
-
-                # Apply +1 logic:
-                if derived_w is not None: # Width was derived from this art
-                    args.min_width = derived_w + 1
-                    log_msg_w = f"Set min_width to {args.min_width} (derived from {source_description_for_log} art '{derived_w}px' + 1)"
-                    if not cli_set_min_width: # Log only if it was actually derived here
-                         logger.info(f"{log_msg_w} as --min-width was not specified.")
-                    else: # This case shouldn't happen if derived_w is not None, but for completeness
-                         logger.info(f"{log_msg_w} (overriding previous derivation or initial None).")
-
-
-                    if derived_h is not None: # Height also derived from this art
-                        # No +1 needed for height if width was already incremented.
-                        log_msg_h = f"Set min_height to {args.min_height} (derived from {source_description_for_log} art '{derived_h}px')"
-                        if not cli_set_min_height:
-                            logger.info(f"{log_msg_h} as --min-height was not specified and width was incremented.")
-                        else:
-                             logger.info(f"{log_msg_h} (overriding previous derivation or initial None).")
-
-                elif derived_h is not None: # Width was CLI-set, Height was derived from this art
-                    args.min_height = derived_h + 1
-                    log_msg_h = f"Set min_height to {args.min_height} (derived from {source_description_for_log} art '{derived_h}px' + 1)"
+            from utils.helpers import get_image_dimensions_from_header
+            if image_data is None:
+                # The header is all we need; a JPEG's frame header can sit behind large EXIF/ICC segments
+                with open(found_art_path_str, "rb") as art_file:
+                    image_data = art_file.read(_IMAGE_HEADER_READ_SIZE)
+            image_size = get_image_dimensions_from_header(image_data)
+            if image_size is None: # Not a PNG/JPEG header we can read ourselves; let Pillow work it out
+                Image = _import_optional("PIL.Image")
+                with Image.open(found_art_path_str) as img:
+                    image_size = img.size
+            img_width, img_height = image_size
+            
+            cli_set_min_width = args.min_width is not None
+            cli_set_min_height = args.min_height is not None
+            
+            derived_w, derived_h = None, None
+
+            if not cli_set_min_width:
+                derived_w = img_width
+                args.min_width = img_width # Temporarily assign for logic below
+            if not cli_set_min_height:
+                derived_h = img_height
+                args.min_height = img_height # Temporarily assign
+
+            # Apply +1 logic:
+            if derived_w is not None: # Width was derived from this art
+                args.min_width = derived_w + 1
+                log_msg_w = "Set min_width to %s (derived from %s art '%spx' + 1)"
+                log_args_w = (args.min_width, source_description_for_log, derived_w)
+                if not cli_set_min_width: # Log only if it was actually derived here
+                     logger.info(log_msg_w + " as --min-width was not specified.", *log_args_w)
+                else: # This case shouldn't happen if derived_w is not None, but for completeness
+                     logger.info(log_msg_w + " (overriding previous derivation or initial None).", *log_args_w)
+
+
+                if derived_h is not None: # Height also derived from this art
+                    # No +1 needed for height if width was already incremented.
+                    log_msg_h = "Set min_height to %s (derived from %s art '%spx')"
+                    log_args_h = (args.min_height, source_description_for_log, derived_h)
                     if not cli_set_min_height:
-                        logger.info(f"{log_msg_h} as --min-height was not specified (and --min-width was CLI-provided).")
+                        logger.info(log_msg_h + " as --min-height was not specified and width was incremented.", *log_args_h)
                     else:
-                         logger.info(f"{log_msg_h} (overriding previous derivation or initial None).")
+                         logger.info(log_msg_h + " (overriding previous derivation or initial None).", *log_args_h)
+
+            elif derived_h is not None: # Width was CLI-set, Height was derived from this art
+                args.min_height = derived_h + 1
+                log_msg_h = "Set min_height to %s (derived from %s art '%spx' + 1)"
+                log_args_h = (args.min_height, source_description_for_log, derived_h)
+                if not cli_set_min_height:
+                    logger.info(log_msg_h + " as --min-height was not specified (and --min-width was CLI-provided).", *log_args_h)
+                else:
+                     logger.info(log_msg_h + " (overriding previous derivation or initial None).", *log_args_h)
 
         except ImportError: 
-            logger.warning(f"Pillow (PIL) library not found. Cannot extract dimensions from {source_description_for_log} art. 'pip install Pillow'.")
+            logger.warning("Pillow (PIL) library not found. Cannot extract dimensions from %s art. 'pip install Pillow'.", source_description_for_log)
         except Exception as e: 
-            logger.warning(f"Could not read dimensions from {source_description_for_log} art '{found_art_path_str}': {e}")
+            logger.warning("Could not read dimensions from %s art '%s': %s", source_description_for_log, found_art_path_str, e)
 
 
 def _handle_from_dir_art_search_fallback(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
@@ -581,50 +835,61 @@ def _handle_from_dir_art_search_fallback(args: argparse.Namespace, parser: argpa
     # args.from_file is guaranteed to be set if _internal_original_from_dir_path is, as per _parse_arguments logic
     music_file_parent_dir = pathlib.Path(args.from_file).parent.resolve() 
     
-    logger.info(f"Performing --from-dir fallback art search in: {original_dir_path}, (excluding files directly within: {music_file_parent_dir})")
+    logger.info("Performing --from-dir fallback art search in: %s, (excluding files directly within: %s)", original_dir_path, music_file_parent_dir)
+    # original_dir_path is already resolved, so paths found under it compare to the excluded
+    # directory as plain strings, without resolving each candidate's parent.
+    excluded_dir_str = os.path.normcase(os.fspath(music_file_parent_dir))
 
     found_art_path_str = None
-    pattern_bases = ["cover", "front", "folder", "album"] # Order can matter for preference
-    image_extensions = [".jpg", ".jpeg", ".png"] # Common image extensions
 
     # 1. Recursively search for common external art files, excluding the music file's immediate parent.
-    # We rglob everything then filter, to allow sorting for some predictability and efficient filtering.
-    all_eligible_files_in_dir_tree = []
+    # Files come in sorted path order (for predictability when e.g. 'cover.jpg' exists at several depths),
+    # so only a strictly better-ranked name replaces the current best, and the top-ranked name ends the search.
+    best_rank, best_match = len(_FALLBACK_TARGET_RANK), None
+    first_image_file: Optional[str] = None
     try:
-        for item in original_dir_path.rglob("*"):
-            if item.is_file():
-                # Exclude files within the music file's immediate parent directory, as it was already checked
-                if item.parent.resolve() != music_file_parent_dir:
-                    all_eligible_files_in_dir_tree.append(item)
-        all_eligible_files_in_dir_tree.sort() # Sort for predictability (e.g. if multiple 'cover.jpg' exist at different depths)
+        for entry in _iter_files_depth_first(str(original_dir_path)):
+            name_lower = entry.name.lower()
+            if os.path.splitext(name_lower)[1] not in _IMAGE_EXTENSION_SET:
+                continue
+            # Exclude files within the music file's immediate parent directory, as it was already checked
+            if os.path.normcase(os.path.dirname(entry.path)) == excluded_dir_str:
+                continue
+            if first_image_file is None:
+                first_image_file = entry.path
+            rank = _FALLBACK_TARGET_RANK.get(name_lower, best_rank)
+            if rank < best_rank:
+                best_rank, best_match = rank, entry.path
+                if rank == 0:
+                    break
     except OSError as e:
-        logger.warning(f"Could not recursively list directory {original_dir_path} for fallback art search: {e}")
+        logger.warning("Could not recursively list directory %s for fallback art search: %s", original_dir_path, e)
         return # Cannot proceed if directory listing fails
 
-    for base_name in pattern_bases:
-        if found_art_path_str: break
-        for ext in image_extensions:
-            target_filename_lower = (base_name + ext).lower()
-            for item in all_eligible_files_in_dir_tree:
-                if item.name.lower() == target_filename_lower:
-                    found_art_path_str = str(item.resolve())
-                    logger.info(f"--from-dir fallback: Found art by pattern match: {found_art_path_str}")
-                    break
-            if found_art_path_str: break
+    if best_match is not None:
+        found_art_path_str = str(pathlib.Path(best_match).resolve())
+        logger.info("--from-dir fallback: Found art by pattern match: %s", found_art_path_str)
     
-    # 2. If no pattern match, fallback: first image file found recursively (from the eligible list)
-    if not found_art_path_str:
-        for item in all_eligible_files_in_dir_tree:
-            if item.suffix.lower() in image_extensions:
-                found_art_path_str = str(item.resolve())
-                logger.info(f"--from-dir fallback: Found first available image file as art: {found_art_path_str}")
-                break
+    # 2. If no pattern match, fallback: first image file found recursively
+    if not found_art_path_str and first_image_file is not None:
+        found_art_path_str = str(pathlib.Path(first_image_file).resolve())
+        logger.info("--from-dir fallback: Found first available image file as art: %s", found_art_path_str)
     
     # 3. If art was found, set args.existing_art_path and try to get dimensions
     if found_art_path_str:
         _set_existing_art_and_derive_dimensions(args, found_art_path_str, f"--from-dir ('{original_dir_path.name}') fallback")
     else:
-        logger.info(f"--from-dir fallback: No suitable art file found in {original_dir_path} (excluding files from {music_file_parent_dir}).")
+        logger.info("--from-dir fallback: No suitable art file found in %s (excluding files from %s).", original_dir_path, music_file_parent_dir)
+
+
+def _build_services_tuples(services_cfg: list) -> list:
+    """
+    Returns the services config in the format CMD_Search expects (list of (name, enabled) tuples).
+    A config loaded from JSON holds lists, which are converted; a list of tuples is returned unchanged.
+    """
+    if services_cfg and isinstance(services_cfg[0], list):
+        return [tuple(s) for s in services_cfg]
+    return services_cfg # Assume it's already list of tuples or empty
 
 
 def _prepare_auto_search_payload(
@@ -640,16 +905,14 @@ def _prepare_auto_search_payload(
     # that are not strictly needed if no auto-search is performed.
     from services.worker import CMD_Search 
 
-    # Use current UI config values for the payload, falling back to defaults if not set.
-    services_cfg = initial_ui_config.get("services", default_config_base.get("services", []))
-    # Ensure services_cfg has the right format (list of tuples) for CMD_Search
-    if services_cfg and isinstance(services_cfg[0], list):
-        services_cfg_tuples = [tuple(s) for s in services_cfg]
-    else:
-        services_cfg_tuples = services_cfg # Assume it's already list of tuples or empty
+    # Use current UI config values for the payload (CLI overrides are already merged in),
+    # falling back to defaults only for keys it doesn't have.
+    def _setting(key: str, fallback: Any) -> Any:
+        return initial_ui_config[key] if key in initial_ui_config else default_config_base.get(key, fallback)
 
-    batch_size = initial_ui_config.get("batch_size", default_config_base.get("batch_size", 5)) # Sensible default
-    front_only = initial_ui_config.get("front_only", default_config_base.get("front_only", True)) # Sensible default
+    services_cfg_tuples = _build_services_tuples(_setting("services", []))
+    batch_size = _setting("batch_size", 5) # Sensible default
+    front_only = _setting("front_only", True) # Sensible default
 
     payload = CMD_Search(
         artist=args.artist if args.artist else "", # CMD_Search expects non-None artist
@@ -658,69 +921,100 @@ def _prepare_auto_search_payload(
         active_services_config=services_cfg_tuples,
         batch_size=batch_size
     )
-    logger.info(f"CLI auto-search payload prepared: Artist='{payload.artist}', Album='{payload.album}'")
+    logger.info("CLI auto-search payload prepared: Artist='%s', Album='%s'", payload.artist, payload.album)
     return payload
 
 
+def _resolve_parsed_arguments(
+    args: argparse.Namespace,
+    parser: argparse.ArgumentParser,
+    user_config_base: dict,
+    default_config_base: dict
+) -> ParseOutcome:
+    """
+    Runs the checks that need more than the parser: --from-file/--from-dir handling (modifying args in-place)
+    and collecting the config overrides. Their parser.error() calls become an ERROR outcome in GUI mode,
+    just like errors from _parse_arguments; on success the outcome carries args and cli_overrides.
+    """
+    try:
+        # Handle --from-file logic (modifies args in-place with extracted data)
+        # This is called even if --from-dir was used, because --from-dir sets args.from_file in _parse_arguments.
+        extract_embedded_art = user_config_base.get("extract_embedded_art", default_config_base.get("extract_embedded_art", True))
+        _handle_from_file_logic(args, parser, extract_embedded_art) # parser is passed for its .error() method
+
+        # If --from-dir was used, and _handle_from_file_logic didn't find any art
+        # (i.e., args.existing_art_path is still None from embedded art or music file's parent dir),
+        # then try the recursive fallback art search in the original --from-dir path.
+        if args._internal_original_from_dir_path and not args.existing_art_path:
+            _handle_from_dir_art_search_fallback(args, parser)
+
+        # Collect general CLI overrides, using default_config_base for reference
+        cli_overrides = _collect_general_cli_overrides(args, user_config_base, default_config_base, parser)
+    except ArgumentParserError as e:
+        return ParseOutcome(ParseOutcomeKind.ERROR, message=str(e))
+    return ParseOutcome(ParseOutcomeKind.OK, args=args, parser=parser, cli_overrides=cli_overrides)
+
+
+def _copy_session_config(config: dict, overrides: Optional[Dict[str, Any]] = None) -> dict:
+    """
+    One-level copy of config with overrides merged over it, for the UI session. The services list
+    gets its own copy too: MainWindow appends missing default services to it in place, which must
+    not reach USER_CONFIG (or DEFAULT_CONFIG, which it is built from) and get saved.
+    """
+    session_config = {**config, **overrides} if overrides else dict(config)
+    if "services" in session_config:
+        session_config["services"] = list(session_config["services"])
+    return session_config
+
+
 def process_cli_arguments(
     user_config_base: dict,
     default_config_base: dict,
     is_console_mode: bool
-) -> Tuple[Optional[dict], bool, Optional["CMD_Search"], Optional[str], Optional[List[Tuple[List[str], Dict[str, Any]]]]]:
+) -> CLIParseResult:
     """
-    Parses CLI arguments, applies them to a copy of user_config_base,
+    Parses CLI arguments, merges their overrides over user_config_base (if they override anything),
     and determines if an initial search should be performed.
 
-    Catches ArgumentParserError and ArgumentParserHelpRequested from _parse_arguments.
+    Help, parse errors and errors from validating the parsed arguments come back as a ParseOutcome (GUI mode).
 
     Returns:
-        A tuple containing:
+        A CLIParseResult (NamedTuple) containing:
         - initial_ui_config (Optional[dict]): Config with CLI overrides, or None on CLI error/help.
+          A one-level merge with its own services list; other nested values are shared with user_config_base.
         - perform_auto_search (bool): True if an auto-search should be launched.
         - initial_search_payload (Optional["CMD_Search"]): Payload for auto-search, or None.
         - cli_error_message (Optional[str]): Error message if parsing failed (for GUI dialog).
-        - help_arg_definitions (Optional[List[Dict]]): Arg definitions for custom help dialog, if help requested.
+        - help_arg_definitions (Optional[ArgDefinitions]): Arg definitions for custom help dialog, if help requested.
     """
-    try:
-        args, parser = _parse_arguments(is_console_mode=is_console_mode)
-    except ArgumentParserError as e:
+    if len(sys.argv) <= 1:
+        # Plain launch (e.g. double-clicking the app): nothing to parse, override or search for,
+        # so don't build the argparse parser at all.
+        return CLIParseResult(_copy_session_config(user_config_base), False, None, None, None)
+
+    outcome = _parse_arguments(is_console_mode=is_console_mode)
+    if outcome.kind is ParseOutcomeKind.OK:
+        outcome = _resolve_parsed_arguments(outcome.args, outcome.parser, user_config_base, default_config_base)
+    if outcome.kind is ParseOutcomeKind.ERROR:
         # In console mode, CustomArgumentParser.error would have already exited.
-        # This catch is primarily for GUI mode.
-        logger.error(f"CLI Argument Parsing Error: {e}")
-        return None, False, None, str(e), None
-    except ArgumentParserHelpRequested as e:
+        # This branch is primarily for GUI mode.
+        logger.error("CLI Argument Parsing Error: %s", outcome.message)
+        return CLIParseResult(None, False, None, outcome.message, None)
+    if outcome.kind is ParseOutcomeKind.HELP:
         # In console mode, help is printed and exited by CustomArgumentParser.
-        # This catch is for GUI mode to show the custom help dialog.
+        # This branch is for GUI mode to show the custom help dialog.
         logger.info("CLI Help Requested (GUI mode).")
-        return None, False, None, None, e.arg_definitions
+        return CLIParseResult(None, False, None, None, outcome.arg_definitions)
     
-    # --- At this point, argument parsing was successful ---
-
-    # Handle --from-file logic (modifies args in-place with extracted data)
-    # This is called even if --from-dir was used, because --from-dir sets args.from_file in _parse_arguments.
-    _handle_from_file_logic(args, parser) # parser is passed for its .error() method
+    # --- At this point, argument parsing and validation were successful ---
+    args, cli_overrides = outcome.args, outcome.cli_overrides
 
-    # If --from-dir was used, and _handle_from_file_logic didn't find any art 
-    # (i.e., args.existing_art_path is still None from embedded art or music file's parent dir),
-    # then try the recursive fallback art search in the original --from-dir path.
-    if args._internal_original_from_dir_path and not args.existing_art_path:
-        _handle_from_dir_art_search_fallback(args, parser)
+    # Overrides only ever replace whole top-level keys, so a one-level merge is enough
+    initial_ui_config = _copy_session_config(user_config_base, cli_overrides)
 
-    # Prepare initial UI configuration by deep copying the user's base configuration
-    initial_ui_config = copy.deepcopy(user_config_base)
+    # An auto-search is performed when album info is present (not None and not an empty string).
+    # _prepare_auto_search_payload returns None exactly when args.album is falsy, so the payload decides.
+    initial_search_payload = _prepare_auto_search_payload(args, initial_ui_config, default_config_base)
+    perform_auto_search = initial_search_payload is not None
 
-    # Apply general CLI overrides to the initial_ui_config, using default_config_base for reference
-    # parser is passed for its .error() method, which now uses CustomArgumentParser's logic
-    _apply_general_cli_overrides(args, initial_ui_config, default_config_base, parser)
-
-    # Determine if an auto-search should be performed based on the presence of album info
-    perform_auto_search = bool(args.album) # True if args.album is not None and not an empty string
-    
-    initial_search_payload = None
-    if perform_auto_search:
-        initial_search_payload = _prepare_auto_search_payload(args, initial_ui_config, default_config_base)
-        if initial_search_payload is None: # Should not happen if perform_auto_search is True
-            perform_auto_search = False 
-            logger.error("Auto-search was indicated but payload preparation failed.")
-        
-    return initial_ui_config, perform_auto_search, initial_search_payload, None, None
+    return CLIParseResult(initial_ui_config, perform_auto_search, initial_search_payload, None, None)
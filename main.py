@@ -5,7 +5,6 @@ start_time = time.time()
 from utils.helpers import setup_logging
 setup_logging()
 
-from PySide6.QtWidgets import QApplication, QMessageBox
 import logging.config
 import sys
 import multiprocessing
@@ -13,11 +12,10 @@ import traceback # For formatting exceptions
 from typing import Optional, Tuple, Any, TYPE_CHECKING
 
 from utils.config import USER_CONFIG, DEFAULT_CONFIG, USER_CONFIG_DIR, USER_CONFIG_FILE, save_user_config, get_initial_config_loading_errors
-from ui.theme_manager import apply_app_theme_and_custom_styles, resolve_theme, apply_theme_tweaks_windows
-from ui.main_window import MainWindow
-from utils.config import USER_CONFIG, DEFAULT_CONFIG, USER_CONFIG_DIR, USER_CONFIG_FILE, save_user_config
 from cli import process_cli_arguments
 
+# PySide6 and the ui package are imported inside main(), once CLI handling has ruled out a
+# console-only exit (--help, argument errors), so those paths never load Qt.
 if TYPE_CHECKING:
     from services.worker import CMD_Search
 
@@ -28,6 +26,8 @@ def handle_global_exception(exc_type, exc_value, exc_traceback):
     """
     Handles unhandled exceptions, logs them, and shows an error dialog.
     """
+    from PySide6.QtWidgets import QApplication, QMessageBox # Already loaded by the time this hook is installed
+
     # Format the traceback
     tb_lines = traceback.format_exception(exc_type, exc_value, exc_traceback)
     error_message_long = "".join(tb_lines)
@@ -78,6 +78,11 @@ def main():
     cli_error_message, help_arg_definitions = \
         process_cli_arguments(USER_CONFIG, DEFAULT_CONFIG, is_console_mode)
 
+    # In console mode, help and argument errors have already been printed and exited above,
+    # so only runs that may need a window get this far
+    from PySide6.QtWidgets import QApplication, QMessageBox
+    from ui.theme_manager import apply_app_theme_and_custom_styles, resolve_theme, apply_theme_tweaks_windows
+
     # Handle CLI parsing results: error, help, or proceed
     if cli_error_message:
         if not is_console_mode:
@@ -110,10 +115,6 @@ def main():
         sys.exit(1)
 
 
-    # Check for configuration loading errors after app object might be created for QMessageBox
-    # We will show this message after QApplication is initialized.
-    initial_config_errors = get_initial_config_loading_errors()
-
     # Set the global exception handler
     sys.excepthook = handle_global_exception
     logger.info("Global exception handler set.")
@@ -122,6 +123,8 @@ def main():
     app.setApplicationVersion("0.2")
 
     # Show configuration load errors now that QApplication exists
+    # (only fetched on this path; help and argument-error exits never need them)
+    initial_config_errors = get_initial_config_loading_errors()
     if initial_config_errors:
         error_str = "\n\n".join(initial_config_errors)
         QMessageBox.warning(None, "Configuration Load Warning",
@@ -134,6 +137,8 @@ def main():
     initial_theme = resolve_theme(initial_theme)
     apply_app_theme_and_custom_styles(initial_theme, use_cache=True)
 
+    from ui.main_window import MainWindow
+
     logger.info("Showing main window")
     main_window = MainWindow(initial_ui_config_from_cli=initial_ui_config,
                              initial_search_payload_for_worker=initial_search_payload_for_worker)
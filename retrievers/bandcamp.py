@@ -1,6 +1,6 @@
 # services/bandcamp.py
 import logging
-from lxml import html
+from lxml import etree, html
 import urllib.parse
 import re
 from typing import List, Optional, Tuple, Dict, Any
@@ -30,8 +30,42 @@ class BandcampRetriever(AbstractImageRetriever):
             r"^(https://[^/]+\.bcbits\.com/img/[a-zA-Z0-9]+)(_[0-9]+)?\.(jpg|png|gif|jpeg)$",
             re.IGNORECASE
         )
+        # Characters replaced with spaces in search terms (compiled once, used twice per search)
+        self.search_term_cleanup_pattern = re.compile(r'[^\w\s-]')
+        # Search pages carry many id attributes that are never looked up by ID, and comments we never read
+        self.search_page_parser = html.HTMLParser(collect_ids=False, remove_comments=True, remove_pis=True)
+        # Page-level XPaths, compiled once and reused by every search
+        self.no_results_xpath = etree.XPath('boolean(//div[@id="search-no-results"])')
+        self.album_results_xpath = etree.XPath(
+            '//li[contains(@class, "searchresult") and @data-search and .//div[@class="itemtype" and normalize-space(text())="ALBUM"]]'
+        )
+        # Per-result XPaths, compiled once since they run for every item of every search.
+        # string() returns "" when nothing matches, so no intermediate lists are built.
+        self.result_album_link_xpath = etree.XPath('(.//div[@class="heading"]/a)[1]')
+        self.result_artist_text_xpath = etree.XPath('.//div[@class="subhead"]/text()', smart_strings=False)
+        self.result_image_src_xpath = etree.XPath('string(.//a[@class="artcont"]//img/@src)', smart_strings=False)
         # self.scraper = cloudscraper.create_scraper() # Handled by base class now
 
+    @staticmethod
+    def _split_bcbits_url(bcbits_url: str) -> Optional[Tuple[str, str]]:
+        """
+        Splits a lowercase bcbits image URL into (base, extension) with plain string operations,
+        accepting exactly what bcbits_img_pattern accepts for such URLs, e.g.
+        https://f4.bcbits.com/img/a1234567890_10.jpg -> ("https://f4.bcbits.com/img/a1234567890", "jpg").
+        Returns None for anything else, which is then left to the (case-insensitive) pattern.
+        """
+        stem, _, extension = bcbits_url.rpartition(".")
+        if extension not in ("jpg", "png", "gif", "jpeg") or not stem.startswith("https://"):
+            return None
+        base_part, underscore, size_suffix = stem.rpartition("_")
+        if not (underscore and size_suffix.isascii() and size_suffix.isdigit()):
+            base_part = stem # No _N size suffix
+        host, img_dir, image_id = base_part[len("https://"):].partition("/img/")
+        if (img_dir and "/" not in host and host.endswith(".bcbits.com") and len(host) > len(".bcbits.com")
+                and image_id.isascii() and image_id.isalnum()):
+            return base_part, extension
+        return None
+
     def _derive_image_urls(self, bcbits_url: str) -> Tuple[Optional[str], Optional[str]]:
         """
         Derives thumbnail and full-size image URLs from a given Bandcamp bcbits.com image URL.
@@ -39,13 +73,15 @@ class BandcampRetriever(AbstractImageRetriever):
         _0 is typically the largest/original version.
         _7 is a common small thumbnail size (150x150).
         """
-        match = self.bcbits_img_pattern.match(bcbits_url)
-        if not match:
-            logger.warning(f"[{self.service_name}] Could not parse bcbits URL: {bcbits_url} with pattern {self.bcbits_img_pattern.pattern}")
-            return None, None
-        
-        base_part = match.group(1)  # e.g., https://f4.bcbits.com/img/a1234567890
-        extension = match.group(3)  # e.g., jpg
+        split_url = self._split_bcbits_url(bcbits_url)
+        if split_url is None:
+            match = self.bcbits_img_pattern.match(bcbits_url) # Handles the case variants the fast path doesn't
+            if not match:
+                logger.warning(f"[{self.service_name}] Could not parse bcbits URL: {bcbits_url} with pattern {self.bcbits_img_pattern.pattern}")
+                return None, None
+            split_url = match.group(1), match.group(3)
+
+        base_part, extension = split_url # e.g., ("https://f4.bcbits.com/img/a1234567890", "jpg")
         
         full_image_url = f"{base_part}_0.{extension}"    # _0 is largest
         thumbnail_url = f"{base_part}_7.{extension}" # _7 is a common small preview size (150px)
@@ -59,10 +95,10 @@ class BandcampRetriever(AbstractImageRetriever):
 
         query_parts = []
         if album:
-            album_clean = re.sub(r'[^\w\s-]', ' ', album.strip()).strip()
+            album_clean = self.search_term_cleanup_pattern.sub(' ', album.strip()).strip()
             if album_clean: query_parts.append(album_clean)
         if artist:
-            artist_clean = re.sub(r'[^\w\s-]', ' ', artist.strip()).strip()
+            artist_clean = self.search_term_cleanup_pattern.sub(' ', artist.strip()).strip()
             if artist_clean: query_parts.append(artist_clean)
 
         if not query_parts:
@@ -106,7 +142,7 @@ class BandcampRetriever(AbstractImageRetriever):
 
         try:
             # Using search_response_obj.content from the previous step
-            tree = html.fromstring(search_response_obj.content)
+            tree = html.fromstring(search_response_obj.content, parser=self.search_page_parser)
         except Exception as e_parse: # lxml can raise various errors
             if self._check_cancelled(cancel_event, "in HTML parse exception handler for search results"):
                 return []
@@ -116,16 +152,16 @@ class BandcampRetriever(AbstractImageRetriever):
 
         # Check for Bandcamp's "no results" indicator first
         # Example: <div id="search-no-results" class="no-results">...</div>
-        # We look for the presence of an element with this ID.
-        no_results_indicator = tree.xpath('//div[@id="search-no-results"]')
+        # We look for the presence of an element with this ID. The ID has to occur in the raw page
+        # for that, so a byte search first spares ordinary result pages a scan of the whole tree.
+        no_results_indicator = (b"search-no-results" in search_response_obj.content
+                                and self.no_results_xpath(tree))
         if no_results_indicator:
             logger.info(f"[{self.service_name}] Bandcamp search for '{search_query}' explicitly indicated no results. URL: {search_url}")
             return [] # This is a successful search with zero results.
         
         # XPath to find list items representing album search results
-        search_results_elements = tree.xpath(
-            '//li[contains(@class, "searchresult") and @data-search and .//div[@class="itemtype" and normalize-space(text())="ALBUM"]]'
-        )
+        search_results_elements = self.album_results_xpath(tree)
         
         if not search_results_elements:
             # If we reach here, it means no "no results" indicator was found,
@@ -135,8 +171,10 @@ class BandcampRetriever(AbstractImageRetriever):
                    f"but no album items were found using primary XPath. "
                    f"Page structure may have changed or XPath is outdated. URL: {search_url}")
             logger.warning(f"[{self.service_name}] {msg}")
-            page_snippet = search_response_obj.text[:1000] if hasattr(search_response_obj, 'text') else "N/A"
-            logger.debug(f"[{self.service_name}] Page snippet for '{search_query}':\n{page_snippet}")
+            if logger.isEnabledFor(logging.DEBUG):
+                # Decode only the bytes shown, rather than the whole body via .text
+                page_snippet = search_response_obj.content[:1000].decode(search_response_obj.encoding or 'utf-8', errors='replace')
+                logger.debug(f"[{self.service_name}] Page snippet for '{search_query}':\n{page_snippet}")
             raise RetrieverDataError(msg, url=search_url)
 
         all_candidates: List[AlbumCandidate] = []
@@ -147,9 +185,8 @@ class BandcampRetriever(AbstractImageRetriever):
             if self._check_cancelled(cancel_event, "in search results loop"):
                 break
             
-            album_name_nodes = result_el.xpath('.//div[@class="heading"]/a')
-            artist_name_text_nodes = result_el.xpath('.//div[@class="subhead"]/text()')
-            img_src_nodes = result_el.xpath('.//a[@class="artcont"]//img/@src')
+            # Only the album link is needed to spot duplicates; everything else is looked up after that check
+            album_name_nodes = self.result_album_link_xpath(result_el)
 
             if not album_name_nodes:
                 # Log skipping this specific item but don't error out the whole search
@@ -163,21 +200,21 @@ class BandcampRetriever(AbstractImageRetriever):
                 logger.warning(f"[{self.service_name}] Skipping a Bandcamp search result item for '{search_query}' due to missing href in album link.")
                 continue
 
-            parsed_original_link = urllib.parse.urlparse(album_page_link_from_search)
-            album_page_link_cleaned = urllib.parse.urlunparse(
-                parsed_original_link._replace(query='', fragment='')
-            )
-            if not parsed_original_link.scheme or not parsed_original_link.netloc:
+            # Drop the query (search tracking parameters) and fragment; search links are normally absolute,
+            # so urljoin is only needed for the odd relative one.
+            album_page_link_cleaned = album_page_link_from_search.split('#', 1)[0].split('?', 1)[0]
+            if not album_page_link_cleaned.startswith(('https://', 'http://')):
                 album_page_link_cleaned = urllib.parse.urljoin(self.base_url, album_page_link_cleaned)
             
             if album_page_link_cleaned in processed_links:
                 continue
 
+            artist_name_text_nodes = self.result_artist_text_xpath(result_el)
             found_album_name = found_album_name_el.text_content().strip()
-            found_artist_name_raw = "".join(t.strip() for t in artist_name_text_nodes).strip()
+            found_artist_name_raw = "".join(map(str.strip, artist_name_text_nodes)).strip()
             
             found_artist_name = found_artist_name_raw
-            if found_artist_name_raw.lower().startswith("by "):
+            if found_artist_name_raw[:3].lower() == "by ": # Lowercase just the prefix, not the whole name
                 found_artist_name = found_artist_name_raw[3:].strip()
             
             if not found_artist_name and artist_name_text_nodes: # If xpath found nodes but text was empty/whitespace
@@ -187,7 +224,7 @@ class BandcampRetriever(AbstractImageRetriever):
 
 
             search_thumb_url, search_full_url = None, None
-            img_src_from_search = img_src_nodes[0] if img_src_nodes else None
+            img_src_from_search = self.result_image_src_xpath(result_el)
             if img_src_from_search:
                 any_image_source_found_overall = True # Mark that at least one image source was found
                 search_thumb_url, search_full_url = self._derive_image_urls(img_src_from_search)
@@ -292,9 +329,9 @@ class BandcampRetriever(AbstractImageRetriever):
 
         logger.debug(f"[{self.service_name}] Resolving details for Bandcamp image: {potential_image.full_image_url}")
         
-        # Use the parent's method to get dimensions. This typically involves standard HTTP HEAD/GET requests.
         # This assumes bcbits.com (where images are hosted) is not Cloudflare-protected like bandcamp.com.
         # If bcbits.com images also require Cloudflare bypass, this part would need to use self.scraper.
+        # Use the parent's method to get dimensions (ranged request for the image header, cached per URL).
         width, height = super().get_image_dimensions(potential_image.full_image_url,
                                                      cancel_event=cancel_event)
         
@@ -3,11 +3,17 @@ import abc
 import inspect
 import logging
 import threading # Added
+import time
+import urllib.parse
+from collections import OrderedDict
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Optional, Tuple, Any, Dict, Type
 from services.models import PotentialImage, ImageResult, AlbumCandidate
 
 from utils.config import DEFAULT_REQUESTS_HEADERS
+from utils.helpers import get_image_dimensions_from_header
 
 
 logger = logging.getLogger(__name__)
@@ -65,6 +71,43 @@ class RetrieverDataError(RetrieverError):
         super().__init__(message, original_exception)
         self.url = url
 
+# --- Rate Limiting ---
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: allows bursts of up to `burst` requests, refilled at `rate` tokens per second.
+    Thread-safe; callers sleep outside the lock until a token is available.
+    """
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cancel_event: Optional[threading.Event] = None) -> bool:
+        """Takes one token, waiting for it if needed. Returns False if cancel_event was set while waiting."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_seconds = (1 - self._tokens) / self.rate
+            if cancel_event:
+                if cancel_event.wait(wait_seconds):
+                    return False
+            else:
+                time.sleep(wait_seconds)
+
+    def defer(self, seconds: float) -> None:
+        """Empties the bucket so that no token becomes available for `seconds` (e.g. from a Retry-After header)."""
+        with self._lock:
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+            self._last_refill = time.monotonic()
+
 # --- Abstract Class ---
 
 class AbstractImageRetriever(abc.ABC):
@@ -80,6 +123,23 @@ class AbstractImageRetriever(abc.ABC):
     in retrievers.__init__.py.
     """
     _registry: Dict[str, Type['AbstractImageRetriever']] = {}
+    # Connections kept per host by the retriever's session; subclasses can raise it if they
+    # resolve many images from one host concurrently.
+    http_pool_maxsize: int = 16
+    # Requests allowed in flight at once to a single host, across all retrievers (see _host_slot)
+    max_concurrent_per_host: int = 4
+    # Request rate allowed for this service's _execute_http_get calls (token bucket, see TokenBucket)
+    requests_per_second: float = 2.0
+    request_burst: int = 5
+    # Longest Retry-After (seconds) honored after a 429 response
+    max_retry_after_seconds: float = 60.0
+    _host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+    _host_semaphores_lock = threading.Lock()
+    # Bytes requested (via Range) when reading an image's dimensions, and the most read if the header is longer
+    dimension_probe_bytes: int = 16 * 1024
+    dimension_probe_max_bytes: int = 128 * 1024
+    # Number of image sizes remembered per retriever by get_image_dimensions (least recently used dropped first)
+    dimension_cache_size: int = 256
 
     def __init_subclass__(cls, **kwargs):
         """
@@ -119,7 +179,71 @@ class AbstractImageRetriever(abc.ABC):
         self.scraper_instance: Optional[Any] = None
         self._cloudscraper_module: Optional[Any] = None
         self._attempted_scraper_init: bool = False
-
+        # One session per retriever, so keep-alive connections are reused across its search requests
+        # and image dimension checks instead of paying a new TCP/TLS handshake for every call.
+        # Created on first use (see http_session), since not every enabled service gets searched.
+        self._http_session: Optional[requests.Session] = None
+        self._http_session_lock = threading.Lock()
+        # Resolved (width, height) per image URL. Images are resolved from several threads, hence the lock.
+        self._dimension_cache: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self._dimension_cache_lock = threading.Lock()
+        self._rate_limiter = TokenBucket(rate=cls.requests_per_second, burst=cls.request_burst)
+
+
+    @property
+    def http_session(self) -> requests.Session:
+        """
+        The retriever's shared requests.Session, created on first use.
+        Image details are resolved from several threads at once; a Session can be shared
+        between them for plain GET requests, so only its creation is guarded.
+        """
+        session = self._http_session
+        if session is None:
+            with self._http_session_lock:
+                if self._http_session is None:
+                    self._http_session = self._create_http_session()
+                session = self._http_session
+        return session
+
+    def _create_http_session(self) -> requests.Session:
+        """
+        Builds the retriever's session with a larger connection pool and transport-level retries.
+        Transient gateway errors (500/502/504) and failed connects are retried by urllib3 with a short
+        backoff. 403/503 are not retried here, as they usually mean a Cloudflare challenge that
+        _perform_http_get_request answers with the scraper fallback, and 429 isn't either, since
+        honoring Retry-After would block the calling thread without seeing cancellation.
+        raise_on_status=False hands the last response back, so raise_for_status() still reports it.
+        """
+        retries = Retry(total=2, backoff_factor=0.3, status_forcelist=(500, 502, 504),
+                        allowed_methods=frozenset({"GET", "HEAD"}), raise_on_status=False)
+        adapter = HTTPAdapter(pool_maxsize=self.http_pool_maxsize, max_retries=retries)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """
+        Returns the semaphore limiting concurrent requests to url's host; use it as a context manager
+        around the request. Shared by all retrievers, since several of them resolve images from the same
+        hosts (e.g. coverartarchive.org) in parallel. The first retriever to contact a host sets its limit.
+        """
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        semaphore = AbstractImageRetriever._host_semaphores.get(host)
+        if semaphore is None:
+            with AbstractImageRetriever._host_semaphores_lock:
+                semaphore = AbstractImageRetriever._host_semaphores.setdefault(
+                    host, threading.BoundedSemaphore(self.max_concurrent_per_host))
+        return semaphore
+
+    def close(self) -> None:
+        """Closes the pooled HTTP connections held by this retriever (including the cloudscraper session, if any)."""
+        with self._http_session_lock:
+            session, self._http_session = self._http_session, None
+        if session is not None:
+            session.close()
+        if self.scraper_instance is not None:
+            self.scraper_instance.close()
 
     @classmethod
     def get_retriever_class(cls, service_name: str) -> Optional[Type['AbstractImageRetriever']]:
@@ -291,7 +415,7 @@ class AbstractImageRetriever(abc.ABC):
             cancel_event (Optional[threading.Event]): Event for cancellation.
             request_context (str): Context for logging/error messages.
             scraper_instance (Optional[Any]): A requests-compatible scraper instance.
-                                              If None, `requests.get` is used.
+                                              If None, the retriever's `http_session` is used.
 
         Returns:
             Optional[requests.Response]: The response object if successful.
@@ -303,17 +427,21 @@ class AbstractImageRetriever(abc.ABC):
         """
         if self._check_cancelled(cancel_event, f"before making {request_context} to {url}"):
             return None
+        if not self._rate_limiter.acquire(cancel_event):
+            logger.debug(f"[{self.service_name}] Operation cancelled while waiting to make {request_context} to {url}.")
+            return None
 
         current_headers = DEFAULT_REQUESTS_HEADERS.copy()
         if extra_headers:
             current_headers.update(extra_headers)
 
-        requester = scraper_instance if scraper_instance else requests
+        requester = scraper_instance if scraper_instance else self.http_session
         
         logger.debug(f"[{self.service_name}] Making {request_context} to {url} with params: {params} using {'scraper' if scraper_instance else 'requests'}")
         response_obj = None
         try:
-            response_obj = requester.get(url, params=params, headers=current_headers, timeout=timeout, allow_redirects=True)
+            with self._host_slot(url):
+                response_obj = requester.get(url, params=params, headers=current_headers, timeout=timeout, allow_redirects=True)
             response_obj.raise_for_status()  # Raises HTTPError for 4xx/5xx
             return response_obj
         except requests.exceptions.Timeout as e_timeout:
@@ -326,6 +454,8 @@ class AbstractImageRetriever(abc.ABC):
             if self._check_cancelled(cancel_event, f"in HTTPError handler for {request_context} to {url}"):
                 return None
             err_msg = f"HTTP error during {request_context} to {url}"
+            if e_http.response is not None and e_http.response.status_code == 429:
+                self._defer_for_retry_after(e_http.response)
             logger.warning(f"[{self.service_name}] {err_msg} - Status: {e_http.response.status_code if e_http.response else 'Unknown'}")
             raise RetrieverAPIError.from_http_error(e_http, custom_message=err_msg) from e_http
         except requests.exceptions.ConnectionError as e_conn: # Covers DNS, Refused, etc.
@@ -353,6 +483,17 @@ class AbstractImageRetriever(abc.ABC):
             logger.error(f"[{self.service_name}] {err_msg}: {e_gen}", exc_info=True)
             raise RetrieverError(err_msg, original_exception=e_gen) from e_gen
 
+    def _defer_for_retry_after(self, response: requests.Response) -> None:
+        """Holds back this service's further requests for the delay a 429 response asks for (1s if it gives none)."""
+        retry_after = response.headers.get("Retry-After", "")
+        try:
+            delay = float(retry_after)
+        except ValueError: # Missing, or an HTTP-date
+            delay = 1.0
+        delay = min(max(delay, 0.0), self.max_retry_after_seconds)
+        logger.info(f"[{self.service_name}] Rate limited by server; delaying further requests by {delay:.1f}s.")
+        self._rate_limiter.defer(delay)
+
     def _perform_http_get_request(
         self,
         url: str,
@@ -500,10 +641,14 @@ class AbstractImageRetriever(abc.ABC):
         """
         Retrieves the dimensions (width, height) of an image from its URL.
 
-        This method attempts to download just enough of the image to determine
-        its dimensions using the PIL/Pillow library, without downloading the
-        entire file if possible. It handles request errors, timeouts, and
-        cancellation.
+        Successful results are cached per URL (up to dimension_cache_size), so an image
+        that turns up again, e.g. shared by several releases, costs no further request.
+        Otherwise this method requests just the start of the image with a Range header
+        (dimension_probe_bytes, then up to dimension_probe_max_bytes if the header
+        wasn't complete yet) and reads the dimensions from it: PNG/JPEG headers
+        directly, other formats with a single PIL/Pillow open. Servers that ignore
+        Range are read from the same response up to the same limit. It handles
+        request errors, timeouts, and cancellation.
 
         **Note for implementers of derived classes:** If the specific API for your
         service provides a more direct or efficient way to obtain image dimensions
@@ -520,9 +665,25 @@ class AbstractImageRetriever(abc.ABC):
             Tuple[Optional[int], Optional[int]]: A tuple containing (width, height)
                                                  if successful, otherwise (None, None).
         """
-        from PIL import Image
-        from io import BytesIO
-        
+        with self._dimension_cache_lock:
+            image_size = self._dimension_cache.get(image_url)
+            if image_size is not None:
+                self._dimension_cache.move_to_end(image_url)
+        if image_size is not None:
+            logger.debug(f"[{self.service_name}] Using cached dimensions for {image_url}")
+            return image_size
+
+        image_size = self._fetch_image_dimensions(image_url, extra_headers, cancel_event)
+        if image_size[0] and image_size[1]:
+            with self._dimension_cache_lock:
+                self._dimension_cache[image_url] = image_size
+                if len(self._dimension_cache) > self.dimension_cache_size:
+                    self._dimension_cache.popitem(last=False)
+        return image_size
+
+    def _fetch_image_dimensions(self, image_url: str, extra_headers: Optional[dict],
+                                cancel_event: Optional[threading.Event]) -> Tuple[Optional[int], Optional[int]]:
+        """Fetches the start of the image and reads its dimensions; see get_image_dimensions."""
         def _check_cancelled_local(context: str = ""): # Renamed to avoid conflict with self._check_cancelled
             if cancel_event and cancel_event.is_set():
                 logger.debug(f"[{self.service_name}] Image dimension check for {image_url} cancelled: {context}")
@@ -532,62 +693,47 @@ class AbstractImageRetriever(abc.ABC):
         if _check_cancelled_local("before request"):
             return None, None
         
-        response_obj = None
+        probe_bytes = self.dimension_probe_bytes
+        max_bytes_to_read_for_dims = self.dimension_probe_max_bytes
         try:
             current_headers = DEFAULT_REQUESTS_HEADERS.copy()
             if extra_headers:
                 current_headers.update(extra_headers)
 
             # Use a timeout to prevent indefinite blocking, allowing cancel checks
-            response_obj = requests.get(image_url, stream=True, headers=current_headers, timeout=10)
-            response_obj.raise_for_status()
-
-            if _check_cancelled_local("after request headers, before content"):
-                return None, None
-
-            image_data = BytesIO()
-            chunk_size = 1024 # Smaller chunk for more frequent cancel checks
-            bytes_read = 0
-            # Max bytes to read for just getting dimensions, to avoid downloading huge files entirely
-            max_bytes_to_read_for_dims = 128 * 1024 # Increased slightly
-
-            for chunk in response_obj.iter_content(chunk_size=chunk_size):
-                if not chunk: 
-                    break # Should not happen with successful status if content-length > 0
-
-                if _check_cancelled_local("during chunk iteration"):
+            current_headers["Range"] = f"bytes=0-{probe_bytes - 1}"
+            with self._host_slot(image_url), self.http_session.get(image_url, stream=True, headers=current_headers, timeout=10) as response_obj:
+                response_obj.raise_for_status()
+                if _check_cancelled_local("after request headers, before content"):
                     return None, None
-                
-                image_data.write(chunk)
-                bytes_read += len(chunk)
-                
-                # Try to open image after a certain amount of data is read
-                # This threshold can be adjusted. 2048 is often enough for headers.
-                if bytes_read > 2048: 
-                    try:
-                        image_data.seek(0)
-                        img = Image.open(image_data)
-                        # Once opened, we have dimensions, no need to read further for this method's purpose
-                        return img.size
-                    except Exception: # PIL.UnidentifiedImageError or other PIL issues
-                        # If it's not enough data yet, continue reading up to max_bytes_to_read_for_dims
-                        if bytes_read >= max_bytes_to_read_for_dims:
-                            logger.warning(f"Could not determine dimensions for {image_url} after reading {bytes_read} bytes (max: {max_bytes_to_read_for_dims}). Image might be incomplete or corrupt at this point.")
-                            return None, None
-                        # else, continue loop to get more data
-            
-            # If loop finished (e.g., small image fully read before 2048 bytes, or read up to max_bytes)
-            if bytes_read > 0:
-                try:
-                    image_data.seek(0)
-                    img = Image.open(image_data)
-                    return img.size
-                except Exception as e_pil:
-                    logger.warning(f"Final attempt to get dimensions for {image_url} (read {bytes_read} bytes) failed: {e_pil}")
+                image_data = self._read_up_to(response_obj.raw, probe_bytes)
+                is_partial_content = response_obj.status_code == 206
+                total_size_str = response_obj.headers.get("Content-Range", "").rpartition("/")[2]
+                image_size = self._image_size_from_bytes(image_data)
+                if image_size is None and not is_partial_content and len(image_data) == probe_bytes:
+                    # Range was ignored and the whole file is coming; keep reading this body up to the limit
+                    image_data += self._read_up_to(response_obj.raw, max_bytes_to_read_for_dims - probe_bytes)
+                    image_size = self._image_size_from_bytes(image_data)
+
+            if (image_size is None and is_partial_content and len(image_data) == probe_bytes
+                    and not (total_size_str.isdigit() and int(total_size_str) <= probe_bytes)):
+                # The header runs past the first range (e.g. large EXIF/ICC segments); fetch the rest up to the limit
+                if _check_cancelled_local("before second range request"):
                     return None, None
+                current_headers["Range"] = f"bytes={probe_bytes}-{max_bytes_to_read_for_dims - 1}"
+                with self._host_slot(image_url), self.http_session.get(image_url, stream=True, headers=current_headers, timeout=10) as response_obj:
+                    response_obj.raise_for_status()
+                    if response_obj.status_code == 206: # Otherwise the body starts over from byte 0
+                        image_data += self._read_up_to(response_obj.raw, max_bytes_to_read_for_dims - probe_bytes)
+                        image_size = self._image_size_from_bytes(image_data)
+
+            if image_size is not None:
+                return image_size
+            if image_data:
+                logger.warning(f"Could not determine dimensions for {image_url} after reading {len(image_data)} bytes (max: {max_bytes_to_read_for_dims}). Image might be incomplete or corrupt at this point.")
             else:
                 logger.warning(f"No data received for image dimension check (0 bytes read): {image_url}")
-                return None, None
+            return None, None
 
         except requests.exceptions.Timeout as e_timeout:
             if _check_cancelled_local("in Timeout handler"): return None, None
@@ -602,13 +748,43 @@ class AbstractImageRetriever(abc.ABC):
             if _check_cancelled_local("in RequestException handler"): return None, None
             logger.warning(f"Request failed for image dimension check {image_url}: {e_req}")
             raise RetrieverNetworkError(f"Request failed for {image_url}: {e_req}", original_exception=e_req, url=image_url) from e_req
-        except Exception as e_gen: # Catch-all for unexpected errors, like PIL errors if not handled above
+        except Exception as e_gen: # Catch-all for unexpected errors
             if _check_cancelled_local("in generic Exception handler"): return None, None
             logger.error(f"Generic error during image dimension check for {image_url}: {e_gen}", exc_info=True)
             # This could be a more generic RetrieverError or re-raised if it's critical
-            # For now, returning None, None for non-network/API PIL issues or truly unexpected things.
-            # If this path is hit by something other than a PIL issue, it might need more specific handling.
+            # For now, returning None, None for non-network/API issues or truly unexpected things.
             return None, None
-        finally:
-            if response_obj: 
-                response_obj.close()
\ No newline at end of file
+
+    @staticmethod
+    def _read_up_to(raw: Any, size: int) -> bytes:
+        """
+        Reads up to `size` bytes from a streamed response's raw body. A single raw.read() may return
+        fewer bytes than asked for before the body ends, so keep reading until `size` or end of stream.
+        """
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            chunk = raw.read(remaining, decode_content=True)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _image_size_from_bytes(image_data: bytes) -> Optional[Tuple[int, int]]:
+        """
+        Returns (width, height) from the first bytes of an image, or None if they aren't enough.
+        PNG/JPEG headers are read directly; when that fails (other formats, or a header layout
+        the parser doesn't handle) Pillow gets one attempt.
+        """
+        image_size = get_image_dimensions_from_header(image_data)
+        if image_size is not None or not image_data:
+            return image_size
+        try:
+            from PIL import Image
+            from io import BytesIO
+            with Image.open(BytesIO(image_data)) as img:
+                return img.size
+        except Exception: # PIL.UnidentifiedImageError, truncated data, or Pillow missing
+            return None
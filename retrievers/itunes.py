@@ -22,6 +22,8 @@ TARGET_THUMBNAIL_DIMENSION_STRING = "300x300"
 
 class ITunesRetriever(AbstractImageRetriever):
     service_name = "iTunes"
+    # The Search API allows roughly 20 calls per minute
+    requests_per_second = 20 / 60
 
     def __init__(self):
         super().__init__()
@@ -530,4 +530,9 @@ class ServiceManager:
         self.service_processing_executor.shutdown(wait=True, cancel_futures=True) 
         logger.info("[ServiceManager] Shutting down image_resolution_executor.")
         self.image_resolution_executor.shutdown(wait=True, cancel_futures=True)
+        for service_name, retriever in self.retrievers.items():
+            try:
+                retriever.close()
+            except Exception as e:
+                logger.warning(f"[{service_name}] Error closing retriever connections: {e}")
         logger.info("[ServiceManager] Executors shutdown complete.")
\ No newline at end of file
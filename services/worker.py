@@ -15,7 +15,7 @@ if TYPE_CHECKING: # slow imports
 logger = logging.getLogger(__name__)
 
 # --- Command Payload Dataclasses ---
-@dataclass
+@dataclass(slots=True) # Built for every search; not frozen, the worker normalizes active_services_config in place
 class CMD_Search:
     artist: str
     album: str
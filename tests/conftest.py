@@ -0,0 +1,7 @@
+import pathlib
+import sys
+
+# The app runs from the project root (python main.py), so its packages are imported as top-level modules
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
@@ -0,0 +1,32 @@
+import pytest
+
+bandcamp = pytest.importorskip("retrievers.bandcamp", reason="the retrievers package needs the app's dependencies from requirements.txt")
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://f4.bcbits.com/img/a1234567890_10.jpg", ("https://f4.bcbits.com/img/a1234567890", "jpg")),
+    ("https://f4.bcbits.com/img/a1234567890.png", ("https://f4.bcbits.com/img/a1234567890", "png")),
+    ("https://f4.bcbits.com/img/0012345678_7.jpeg", ("https://f4.bcbits.com/img/0012345678", "jpeg")),
+    ("https://f4.bcbits.com/img/a1234567890_x.jpg", None), # Not a numeric size suffix
+    ("https://f4.bcbits.com/img/a12/34_10.jpg", None),
+    ("https://bcbits.com/img/a1234567890_10.jpg", None), # Needs a subdomain
+    ("https://f4.bcbits.com.evil.example/img/a1_10.jpg", None),
+    ("http://f4.bcbits.com/img/a1234567890_10.jpg", None),
+    ("https://f4.bcbits.com/img/a1234567890_10.webp", None),
+    ("https://f4.bcbits.com/img/_10.jpg", None),
+])
+def test_split_bcbits_url(url, expected):
+    assert bandcamp.BandcampRetriever._split_bcbits_url(url) == expected
+
+
+@pytest.mark.parametrize("url", [
+    "https://f4.bcbits.com/img/a1234567890_10.jpg",
+    "https://f4.bcbits.com/img/a1234567890.gif",
+    "https://f4.bcbits.com/img/a12/34_10.jpg",
+    "https://f4.bcbits.com/img/a1234567890_10_2.jpg",
+    "https://x.y.bcbits.com/img/abc_0.png",
+    "https://f4.bcbits.com/img/a1_.jpg",
+])
+def test_split_bcbits_url_agrees_with_the_pattern(url):
+    match = bandcamp.BandcampRetriever().bcbits_img_pattern.match(url)
+    assert bandcamp.BandcampRetriever._split_bcbits_url(url) == (match and (match.group(1), match.group(3)))
@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+base_retriever = pytest.importorskip("retrievers.base_retriever", reason="the retrievers package needs the app's dependencies from requirements.txt")
+
+
+class _FakeClock:
+    """Stands in for the time module in base_retriever: sleeping just advances monotonic()."""
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept += seconds
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = _FakeClock()
+    monkeypatch.setattr(base_retriever, "time", fake_clock)
+    return fake_clock
+
+
+def test_token_bucket_allows_a_burst_then_paces(clock):
+    bucket = base_retriever.TokenBucket(rate=2.0, burst=3)
+    for _ in range(3):
+        assert bucket.acquire()
+    assert clock.slept == 0
+    assert bucket.acquire()
+    assert clock.slept == pytest.approx(0.5)
+
+
+def test_token_bucket_refills_up_to_burst_only(clock):
+    bucket = base_retriever.TokenBucket(rate=1.0, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 60
+    for _ in range(2):
+        bucket.acquire()
+    assert clock.slept == 0
+    bucket.acquire()
+    assert clock.slept == pytest.approx(1.0)
+
+
+def test_token_bucket_defer_holds_back_the_next_token(clock):
+    bucket = base_retriever.TokenBucket(rate=2.0, burst=5)
+    bucket.defer(3.0)
+    assert bucket.acquire()
+    assert clock.slept == pytest.approx(3.0)
+
+
+def test_token_bucket_acquire_returns_false_when_cancelled(clock):
+    bucket = base_retriever.TokenBucket(rate=1.0, burst=1)
+    bucket.acquire()
+    cancel_event = threading.Event()
+    cancel_event.set()
+    assert bucket.acquire(cancel_event) is False
@@ -0,0 +1,164 @@
+import sys
+
+import pytest
+
+import cli
+
+USER_CONFIG = {
+    "services": [["Bandcamp", True], ["iTunes", False], ["Last.fm", True]],
+    "batch_size": 5,
+    "front_only": True,
+}
+DEFAULT_CONFIG = {
+    "services": [["Bandcamp", True], ["iTunes", True], ["Last.fm", True]],
+    "batch_size": 5,
+    "front_only": True,
+}
+
+
+def _process(monkeypatch, *argv, console=False):
+    monkeypatch.setattr(sys, "argv", ["CoverFetcher", *argv])
+    return cli.process_cli_arguments(USER_CONFIG, DEFAULT_CONFIG, console)
+
+
+def _parse(monkeypatch, *argv, console=False):
+    monkeypatch.setattr(sys, "argv", ["CoverFetcher", *argv])
+    return cli._parse_arguments(is_console_mode=console)
+
+
+def test_config_without_overrides_is_a_session_copy(monkeypatch):
+    initial_ui_config, perform_auto_search, _payload, error_message, _help = _process(monkeypatch, "-a", "Kid A")
+    assert error_message is None and perform_auto_search
+    assert initial_ui_config == USER_CONFIG
+    assert initial_ui_config is not USER_CONFIG
+    assert initial_ui_config["services"] is not USER_CONFIG["services"]
+
+
+def test_overrides_are_merged_without_touching_the_user_config(monkeypatch):
+    initial_ui_config, *_ = _process(monkeypatch, "--services", "bandcamp,itunes", "--batch-size", "3", "-a", "X")
+    assert initial_ui_config["services"] == [["Bandcamp", True], ["iTunes", True], ["Last.fm", False]]
+    assert initial_ui_config["batch_size"] == 3
+    assert USER_CONFIG["services"] == [["Bandcamp", True], ["iTunes", False], ["Last.fm", True]]
+    assert USER_CONFIG["batch_size"] == 5
+
+
+def test_services_list_is_copied_when_other_keys_are_overridden(monkeypatch):
+    initial_ui_config, *_ = _process(monkeypatch, "--batch-size", "3", "-a", "X")
+    assert initial_ui_config["services"] == USER_CONFIG["services"]
+    assert initial_ui_config["services"] is not USER_CONFIG["services"]
+
+
+def test_parse_outcome_ok_carries_args_and_parser(monkeypatch):
+    outcome = _parse(monkeypatch, "Radiohead - Kid A")
+    assert outcome.kind is cli.ParseOutcomeKind.OK
+    assert (outcome.args.artist, outcome.args.album) == ("Radiohead", "Kid A")
+    assert outcome.parser is not None
+
+
+def test_parse_outcome_help_in_gui_mode(monkeypatch):
+    outcome = _parse(monkeypatch, "-h")
+    assert outcome.kind is cli.ParseOutcomeKind.HELP
+    assert outcome.arg_definitions == cli._arg_definitions()
+
+
+@pytest.mark.parametrize("argv, expected", [
+    (("--bogus",), "unrecognized arguments"),
+    (("--front-only", "--no-front-only", "x"), "--front-only and --no-front-only"),
+    (("--artist", "A"), "--album is required"),
+    (("Kid A", "--album", "B"), "Cannot use 'query'"),
+])
+def test_parse_outcome_error_in_gui_mode(monkeypatch, argv, expected):
+    outcome = _parse(monkeypatch, *argv)
+    assert outcome.kind is cli.ParseOutcomeKind.ERROR
+    assert expected in outcome.message
+
+
+def test_parse_errors_in_console_mode_exit(monkeypatch, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        _parse(monkeypatch, "--artist", "A", console=True)
+    assert exc_info.value.code == 2
+    assert "--album is required" in capsys.readouterr().err
+
+
+def test_process_returns_a_cli_parse_result(monkeypatch):
+    result = _process(monkeypatch, "Radiohead - Kid A")
+    assert isinstance(result, cli.CLIParseResult)
+    assert result.perform_auto_search
+    assert (result.initial_search_payload.artist, result.initial_search_payload.album) == ("Radiohead", "Kid A")
+    assert result.cli_error_message is None and result.help_arg_definitions is None
+
+
+def test_process_reports_help_and_parse_errors_in_gui_mode(monkeypatch):
+    help_result = _process(monkeypatch, "--help")
+    assert help_result.initial_ui_config is None
+    assert help_result.help_arg_definitions == cli._arg_definitions()
+    error_result = _process(monkeypatch, "--bogus")
+    assert error_result.initial_ui_config is None
+    assert "unrecognized arguments" in error_result.cli_error_message
+
+
+def test_from_file_with_all_metadata_given_skips_tags_and_finds_cover(monkeypatch, tmp_path):
+    music_file = tmp_path / "01.flac"
+    music_file.write_bytes(b"") # Not a readable audio file, so this only passes if taglib isn't consulted
+    (tmp_path / "Folder.JPG").write_bytes(b"x")
+    result = _process(monkeypatch, str(music_file), "--artist", "A", "--album", "B", "-o", str(tmp_path))
+    assert result.cli_error_message is None
+    assert result.initial_ui_config["current_album_art_path"] == str(tmp_path / "Folder.JPG")
+
+
+@pytest.mark.parametrize("argv, expected", [
+    (("--batch-size", "0", "-a", "X"), "must be a positive integer, got 0"),
+    (("--min-width", "-1", "-a", "X"), "must be a non-negative integer, got -1"),
+    (("--batch-size", "many", "-a", "X"), "invalid int value: 'many'"),
+])
+def test_integer_ranges_are_checked_while_parsing(monkeypatch, argv, expected):
+    outcome = _parse(monkeypatch, *argv)
+    assert outcome.kind is cli.ParseOutcomeKind.ERROR
+    assert expected in outcome.message
+
+
+def test_no_arguments_returns_a_session_copy_without_building_the_parser(monkeypatch):
+    monkeypatch.setattr(cli, "_build_parser", lambda *args, **kwargs: pytest.fail("parser built for a plain launch"))
+    result = _process(monkeypatch)
+    assert result.initial_ui_config == USER_CONFIG
+    assert result.initial_ui_config is not USER_CONFIG
+    assert result.initial_ui_config["services"] is not USER_CONFIG["services"]
+    assert result[1:] == (False, None, None, None)
+
+
+@pytest.mark.parametrize("argv, expected", [
+    (("--services", "nope", "-a", "X"), "Service(s) 'nope' not recognized"),
+    (("-f", "  ", "-a", "X"), "Empty filename"),
+    (("--from-file", "does/not/exist.flac", "-a", "X"), "File not found"),
+    (("--existing-art-path", "does/not/exist.jpg", "-a", "X"), "--existing-art-path"),
+])
+def test_errors_after_parsing_in_gui_mode_become_messages(monkeypatch, argv, expected):
+    result = _process(monkeypatch, *argv)
+    assert result.initial_ui_config is None
+    assert expected in result.cli_error_message
+
+
+def test_query_naming_an_existing_file_is_used_as_from_file(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "01 - Track.flac").write_bytes(b"")
+    outcome = _parse(monkeypatch, "01 - Track.flac")
+    assert outcome.kind is cli.ParseOutcomeKind.OK
+    assert outcome.args.query is None
+    assert outcome.args.from_file == str(tmp_path / "01 - Track.flac")
+
+
+def test_query_naming_an_existing_folder_is_used_as_from_dir(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "Artist - Album").mkdir()
+    (tmp_path / "Artist - Album" / "t.mp3").write_bytes(b"")
+    outcome = _parse(monkeypatch, "Artist - Album")
+    assert outcome.kind is cli.ParseOutcomeKind.OK
+    assert outcome.args.query is None
+    assert outcome.args._internal_original_from_dir_path == str(tmp_path / "Artist - Album")
+
+
+def test_query_that_is_not_an_existing_path_is_split(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    outcome = _parse(monkeypatch, "Radiohead - Kid A")
+    assert outcome.args.from_file is None and outcome.args.from_dir is None
+    assert (outcome.args.artist, outcome.args.album) == ("Radiohead", "Kid A")
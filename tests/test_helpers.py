@@ -0,0 +1,46 @@
+import struct
+
+from utils.helpers import get_image_dimensions_from_header
+
+
+def _png(width: int, height: int) -> bytes:
+    return b"\x89PNG\r\n\x1a\n" + b"\x00\x00\x00\rIHDR" + struct.pack(">II", width, height) + b"\x08\x02\x00\x00\x00"
+
+
+def _jpeg(width: int, height: int, sof_marker: int = 0xC0, app_payload: bytes = b"JFIF\x00") -> bytes:
+    app0 = b"\xff\xe0" + struct.pack(">H", len(app_payload) + 2) + app_payload
+    dht = b"\xff\xc4" + struct.pack(">H", 4) + b"\x00\x00" # Must be skipped, not read as a frame header
+    sof = bytes((0xFF, sof_marker)) + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + app0 + dht + sof + b"\xff\xda"
+
+
+def test_png_dimensions():
+    assert get_image_dimensions_from_header(_png(300, 200)) == (300, 200)
+
+
+def test_jpeg_baseline_sof0():
+    assert get_image_dimensions_from_header(_jpeg(640, 480)) == (640, 480)
+
+
+def test_jpeg_progressive_sof2():
+    assert get_image_dimensions_from_header(_jpeg(1200, 1200, sof_marker=0xC2)) == (1200, 1200)
+
+
+def test_jpeg_skips_large_app_segments_and_fill_bytes():
+    data = _jpeg(800, 600, app_payload=b"Exif\x00\x00" + b"\x00" * 30000)
+    data = data[:2] + b"\xff\xff" + data[2:] # Fill bytes before a marker are allowed
+    assert get_image_dimensions_from_header(data) == (800, 600)
+
+
+def test_truncated_input_returns_none():
+    assert get_image_dimensions_from_header(_png(300, 200)[:20]) is None
+    jpeg = _jpeg(640, 480, app_payload=b"\x00" * 100)
+    assert get_image_dimensions_from_header(jpeg[:60]) is None # Cut inside the APP0 segment
+    assert get_image_dimensions_from_header(b"") is None
+
+
+def test_zero_dimensions_and_other_formats_return_none():
+    assert get_image_dimensions_from_header(_png(0, 200)) is None
+    assert get_image_dimensions_from_header(_jpeg(640, 0)) is None
+    assert get_image_dimensions_from_header(b"GIF89a" + b"\x00" * 32) is None
+    assert get_image_dimensions_from_header(b"\xff\xd8" + b"garbage" * 4) is None
@@ -2,10 +2,10 @@
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QTextEdit, QDialogButtonBox, QScrollArea, QWidget, QGridLayout, QLabel
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFontMetrics
-from typing import List, Dict, Any, Tuple
+from typing import Any, Mapping, Sequence, Tuple
 
 class HelpDialog(QDialog):
-    def __init__(self, arg_definitions: List[Tuple[List[str], Dict[str, Any]]], parent: QWidget = None):
+    def __init__(self, arg_definitions: Sequence[Tuple[Sequence[str], Mapping[str, Any]]], parent: QWidget = None):
         super().__init__(parent)
         self.setWindowTitle("Command Line Options - Cover Fetcher")
         self.setMinimumWidth(300)
@@ -223,11 +223,13 @@ class MainWindow(QMainWindow):
         self.worker_process: Optional[multiprocessing.Process] = None
         self.worker_pid: Optional[int] = None
 
-        _services_list = self.session_config.get("services", DEFAULT_CONFIG["services"])
+        # Copy before appending, so missing defaults don't leak into USER_CONFIG/DEFAULT_CONFIG
+        _services_list = list(self.session_config.get("services", DEFAULT_CONFIG["services"]))
         existing_service_names = {name for name, enabled in _services_list}
         for default_name, default_enabled in DEFAULT_CONFIG["services"]:
             if default_name not in existing_service_names:
                 _services_list.append((default_name, default_enabled))
+        self.session_config["services"] = _services_list
 
         self.configured_services: List[Tuple[str, bool]] = [tuple(s) for s in _services_list]
 
@@ -89,6 +89,14 @@ CONFIG_ITEM_DEFINITIONS: List[ConfigItem] = [
         category=ConfigCategory.BEHAVIOR,
         default=False,
         tooltip="If checked, the application will close automatically after an image is successfully downloaded."
+    ),
+    ConfigItem(
+        key="extract_embedded_art",
+        label="Use Embedded Art from Music Files",
+        ui_type=ConfigUIType.BOOL,
+        category=ConfigCategory.BEHAVIOR,
+        default=True,
+        tooltip="If checked, --from-file/--from-dir fall back to the cover art embedded in the music file when no image file is found next to it."
     ),
      ConfigItem(
         key="batch_size",
@@ -3,7 +3,8 @@ import pathlib
 import logging
 import sys
 import os
-from typing import Optional
+import struct
+from typing import Optional, Tuple
 
 DEFAULT_LOG_LEVEL = logging.DEBUG # Temporary default
 logger = logging.getLogger(__name__)
@@ -89,6 +90,7 @@ def get_bundle_dir() -> pathlib.Path:
     Returns the base directory for the application.
     For bundled apps, it's the executable's dir or _MEIPASS.
     For development, it's the project root (assumed to be parent of 'utils' and 'assets').
+    For a zipapp build, it's the directory containing the .pyz.
     """
     if getattr(sys, 'frozen', False):
         if hasattr(sys, '_MEIPASS'):
@@ -100,4 +102,41 @@ def get_bundle_dir() -> pathlib.Path:
         # __file__ in utils/helpers.py -> project_root/utils/helpers.py
         # .parent -> project_root/utils
         # .parent.parent -> project_root
-        return pathlib.Path(__file__).resolve().parent.parent
\ No newline at end of file
+        project_root = pathlib.Path(__file__).resolve().parent.parent
+        if project_root.is_file(): # Running from a zipapp (see build_pyz.py); data files sit next to the .pyz
+            return project_root.parent
+        return project_root
+
+
+def get_image_dimensions_from_header(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Reads (width, height) directly from the header bytes of a PNG or JPEG image,
+    without decoding it or importing Pillow.
+    Returns None for other formats, or if the header is truncated or malformed.
+    """
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        if len(data) >= 24 and data[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", data[16:24])
+            if width and height:
+                return width, height
+        return None
+
+    if data[:2] == b"\xff\xd8": # JPEG: walk the marker segments up to the first SOFn frame header
+        pos = 2
+        while pos + 9 <= len(data):
+            if data[pos] != 0xFF:
+                return None
+            marker = data[pos + 1]
+            if marker == 0xFF: # Fill byte
+                pos += 1
+                continue
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8: # Standalone markers without a length field
+                pos += 2
+                continue
+            # SOF0-SOF15, except DHT (C4), JPG (C8) and DAC (CC): length(2) precision(1) height(2) width(2)
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">HH", data[pos + 5:pos + 9])
+                return (width, height) if width and height else None
+            segment_length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+            pos += 2 + segment_length
+    return None